@@ -8,15 +8,22 @@ the retrieved context using the Google Gemini API.
 """
 
 import asyncio
+import json
 import logging
 import os
+import time
+from contextlib import asynccontextmanager
 from datetime import datetime
-from typing import Dict, List, Any, Optional
-from fastapi import FastAPI, HTTPException
-from pydantic import BaseModel
-from openai import OpenAI
+from typing import AsyncIterator, Dict, List, Any, Optional, Tuple
+
+import httpx
+import numpy as np
+from fastapi import FastAPI, HTTPException, Request, Response
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter
+from openai import AsyncOpenAI
 from clients.qdrant_client import QdrantService
-from clients.cohere_client import CohereService
+from clients.cohere_client import CohereService, BatchedEmbedder
 from config import get_config
 
 
@@ -24,16 +31,28 @@ from config import get_config
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# System message that emphasizes using only the provided context
+SYSTEM_PROMPT = (
+    "You are a helpful AI assistant that answers questions based ONLY on the provided context. "
+    "Do not use any prior knowledge or information not contained in the provided context. "
+    "If the context does not contain information to answer the question, say so explicitly. "
+    "Always cite the sources when providing information."
+)
+
 
 class AgentQueryRequest(BaseModel):
     """Request model for the agent query endpoint"""
     query: str
     max_chunks: int = 5
     min_score: float = 0.5
+    # HNSW beam width; bounded so bad input is a 422 rather than a Qdrant error
+    hnsw_ef: Optional[int] = Field(64, ge=1, le=512)
 
 
 class SourceInfo(BaseModel):
     """Information about a source used in the response"""
+    model_config = ConfigDict(extra='forbid')
+
     source_url: str
     similarity_score: float
     content: str
@@ -41,6 +60,8 @@ class SourceInfo(BaseModel):
 
 class RetrievalInfo(BaseModel):
     """Information about the retrieval process"""
+    model_config = ConfigDict(extra='forbid')
+
     chunks_count: int
     avg_similarity: float
     processing_time: float
@@ -48,6 +69,8 @@ class RetrievalInfo(BaseModel):
 
 class AgentQueryResponse(BaseModel):
     """Response model for the agent query endpoint"""
+    model_config = ConfigDict(extra='forbid')
+
     query: str
     answer: str
     sources: List[SourceInfo]
@@ -56,22 +79,137 @@ class AgentQueryResponse(BaseModel):
     timestamp: str
 
 
+# Validates a whole list of sources in a single pydantic-core call
+SOURCES_ADAPTER = TypeAdapter(List[SourceInfo])
+
+
+class SemanticCache:
+    """
+    In-memory cache of recent answers, looked up by query embedding similarity
+
+    Cached query embeddings are kept L2-normalised in a single float32 matrix
+    so a lookup is one matrix-vector product. Entries expire after a TTL and
+    the least recently used entry is evicted when the cache is full.
+    """
+
+    def __init__(self, threshold: float = 0.95, max_entries: int = 256, ttl_seconds: float = 3600.0):
+        """
+        Initialize the semantic cache
+
+        Args:
+            threshold: Minimum cosine similarity for a cached answer to be reused
+            max_entries: Maximum number of cached answers (0 disables the cache)
+            ttl_seconds: How long a cached answer stays valid
+        """
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._embeddings: Optional[np.ndarray] = None
+        self._entries: List[Dict[str, Any]] = []
+        self._last_used = np.zeros(max_entries, dtype=np.float64)
+        self._created_at = np.zeros(max_entries, dtype=np.float64)
+        self._size = 0
+
+    @staticmethod
+    def _normalize(query_embedding: List[float]) -> np.ndarray:
+        """
+        Convert an embedding to a unit-length float32 vector
+        """
+        vector = np.asarray(query_embedding, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm > 0 else vector
+
+    def lookup(self, query_embedding: List[float], key: Tuple = ()) -> Optional[Dict[str, Any]]:
+        """
+        Return the cached response for the most similar live query, if any
+
+        Args:
+            query_embedding: Embedding of the incoming query
+            key: Request parameters that must match the cached entry exactly
+
+        Returns:
+            The cached response, or None on a miss
+        """
+        if self._size == 0:
+            return None
+
+        now = time.monotonic()
+        scores = self._embeddings[:self._size] @ self._normalize(query_embedding)
+
+        candidates = np.flatnonzero(scores >= self.threshold)
+        for idx in candidates[np.argsort(scores[candidates])[::-1]]:
+            entry = self._entries[idx]
+            if entry['key'] != key or now - entry['created_at'] > self.ttl_seconds:
+                continue
+            self._last_used[idx] = now
+            return entry['response']
+
+        return None
+
+    def add(self, query_embedding: List[float], response: Dict[str, Any], key: Tuple = ()):
+        """
+        Cache a response for a query embedding
+
+        Args:
+            query_embedding: Embedding of the answered query
+            response: The response to reuse for similar queries
+            key: Request parameters the response was produced with
+        """
+        if self.max_entries <= 0:
+            return
+
+        vector = self._normalize(query_embedding)
+        if self._embeddings is None:
+            self._embeddings = np.zeros((self.max_entries, vector.shape[0]), dtype=np.float32)
+
+        now = time.monotonic()
+        entry = {'key': key, 'created_at': now, 'response': response}
+
+        if self._size < self.max_entries:
+            idx = self._size
+            self._entries.append(entry)
+            self._size += 1
+        else:
+            # Reuse the slot of an expired entry, or else evict the least recently used one
+            expired = np.flatnonzero(now - self._created_at > self.ttl_seconds)
+            idx = int(expired[0]) if expired.size else int(np.argmin(self._last_used))
+            self._entries[idx] = entry
+
+        self._embeddings[idx] = vector
+        self._last_used[idx] = now
+        self._created_at[idx] = now
+
+
 class RetrievalTool:
     """Tool for retrieving relevant chunks from Qdrant based on user queries"""
 
-    def __init__(self, qdrant_service: QdrantService, cohere_service: CohereService):
+    def __init__(
+        self,
+        qdrant_service: QdrantService,
+        cohere_service: CohereService,
+        embedder: Optional[BatchedEmbedder] = None
+    ):
         """
         Initialize the retrieval tool with required services
 
         Args:
             qdrant_service: Service for interacting with Qdrant vector database
             cohere_service: Service for generating embeddings with Cohere
+            embedder: Batching embedder for query embeddings (created if not given)
         """
         self.qdrant_service = qdrant_service
         self.cohere_service = cohere_service
+        self.embedder = embedder or BatchedEmbedder(cohere_service)
         self.logger = logging.getLogger(__name__)
 
-    def retrieve_context(self, query: str, max_chunks: int = 5, min_score: float = 0.5) -> Dict[str, Any]:
+    async def retrieve_context(
+        self,
+        query: str,
+        max_chunks: int = 5,
+        min_score: float = 0.5,
+        query_embedding: Optional[np.ndarray] = None,
+        hnsw_ef: Optional[int] = None
+    ) -> Dict[str, Any]:
         """
         Retrieve relevant document chunks from Qdrant based on the query
 
@@ -79,60 +217,127 @@ class RetrievalTool:
             query: The user's query string
             max_chunks: Maximum number of chunks to retrieve
             min_score: Minimum similarity score for inclusion
+            query_embedding: Precomputed embedding of the query, if available
+            hnsw_ef: HNSW beam width for the search (None uses the collection default)
 
         Returns:
             Dictionary containing retrieved chunks and metadata
         """
         self.logger.info(f"Retrieving context for query: '{query[:50]}...'")
 
-        start_time = datetime.now()
+        start_time = time.perf_counter()
 
         try:
             # Generate embedding for the query using Cohere
-            query_embedding = self.cohere_service.generate_single_embedding(query)
-            self.logger.debug(f"Generated embedding with {len(query_embedding)} dimensions")
+            if query_embedding is None:
+                query_embedding = await self.embedder.embed_one(query)
+                self.logger.debug(f"Generated embedding with {len(query_embedding)} dimensions")
 
             # Search in Qdrant for similar vectors
-            results = self.qdrant_service.search_similar(query_embedding, limit=max_chunks)
-
-            # Filter results by minimum score and extract relevant information
-            filtered_results = []
-            total_score = 0.0
-
-            for result in results:
-                score = result.get('score', 0)
-
-                if score >= min_score:
-                    payload = result.get('payload', {})
-                    filtered_results.append({
-                        'id': result.get('id'),
-                        'content': payload.get('content', ''),
-                        'score': score,
-                        'source_url': payload.get('source_url', ''),
-                        'document_hierarchy': payload.get('document_hierarchy', '')
-                    })
-                    total_score += score
-
-            # Calculate average similarity score
-            avg_similarity = total_score / len(filtered_results) if filtered_results else 0.0
-
-            processing_time = (datetime.now() - start_time).total_seconds()
-
-            self.logger.info(f"Retrieved {len(filtered_results)} relevant chunks for query: '{query[:30]}...'")
-
-            return {
-                'chunks': filtered_results,
-                'query_embedding': query_embedding,
-                'retrieval_score_threshold': min_score,
-                'total_retrieved': len(filtered_results),
-                'avg_similarity': avg_similarity,
-                'processing_time': processing_time
-            }
+            results = await self.qdrant_service.search_similar_async(query_embedding, limit=max_chunks, hnsw_ef=hnsw_ef)
+
+            processing_time = time.perf_counter() - start_time
+
+            self.logger.info(f"Retrieved {len(results)} candidate chunks for query: '{query[:30]}...'")
+
+            return self._build_retrieval_result(results, query_embedding, min_score, processing_time)
 
         except Exception as e:
             self.logger.error(f"Error retrieving context for query '{query[:30]}...': {str(e)}")
             raise
 
+    async def retrieve_batch(
+        self,
+        queries: List[str],
+        max_chunks: int = 5,
+        min_score: float = 0.5,
+        hnsw_ef: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Retrieve context for several queries at once (e.g. multi-query or HyDE expansions)
+
+        Queries are embedded in batched Cohere requests (96 texts each) and the
+        Qdrant searches are issued concurrently.
+
+        Args:
+            queries: The query strings to retrieve context for
+            max_chunks: Maximum number of chunks to retrieve per query
+            min_score: Minimum similarity score for inclusion
+            hnsw_ef: HNSW beam width for the searches (None uses the collection default)
+
+        Returns:
+            List of retrieval results, in the same order as the queries
+        """
+        if not queries:
+            return []
+
+        self.logger.info(f"Retrieving context for {len(queries)} queries")
+
+        start_time = time.perf_counter()
+
+        try:
+            query_embeddings = await self.cohere_service.generate_embeddings_async(queries)
+
+            all_results = await asyncio.gather(*[
+                self.qdrant_service.search_similar_async(query_embedding, limit=max_chunks, hnsw_ef=hnsw_ef)
+                for query_embedding in query_embeddings
+            ])
+
+            processing_time = time.perf_counter() - start_time
+
+            return [
+                self._build_retrieval_result(results, query_embedding, min_score, processing_time)
+                for results, query_embedding in zip(all_results, query_embeddings)
+            ]
+
+        except Exception as e:
+            self.logger.error(f"Error retrieving context for batch of {len(queries)} queries: {str(e)}")
+            raise
+
+    def _build_retrieval_result(
+        self,
+        results: List[Dict[str, Any]],
+        query_embedding: List[float],
+        min_score: float,
+        processing_time: float
+    ) -> Dict[str, Any]:
+        """
+        Filter search results by minimum score and extract relevant information
+        """
+        scores = np.fromiter(
+            (result.get('score', 0) for result in results), dtype=np.float64, count=len(results)
+        )
+        mask = scores >= min_score
+
+        filtered_results = []
+        for idx in np.flatnonzero(mask):
+            result = results[idx]
+            payload = result.get('payload', {})
+            content = payload.get('content', '')
+            filtered_results.append({
+                'id': result.get('id'),
+                'content': content,
+                'preview': content[:200] + "..." if len(content) > 200 else content,
+                'score': result.get('score', 0),
+                'source_url': payload.get('source_url', ''),
+                'document_hierarchy': payload.get('document_hierarchy', '')
+            })
+
+        filtered_scores = scores[mask]
+
+        # Calculate average similarity score
+        avg_similarity = float(filtered_scores.mean()) if filtered_scores.size else 0.0
+
+        return {
+            'chunks': filtered_results,
+            'scores': filtered_scores,
+            'query_embedding': query_embedding,
+            'retrieval_score_threshold': min_score,
+            'total_retrieved': len(filtered_results),
+            'avg_similarity': avg_similarity,
+            'processing_time': processing_time
+        }
+
 
 class AIAgent:
     """AI Agent with retrieval capabilities using Google Gemini and RAG"""
@@ -148,24 +353,73 @@ class AIAgent:
         self.qdrant_service = QdrantService(
             self.config.qdrant_url,
             self.config.qdrant_api_key,
-            self.config.qdrant_collection_name
+            self.config.qdrant_collection_name,
+            self.config.qdrant_quantization,
+            self.config.qdrant_prefer_grpc,
+            self.config.qdrant_grpc_port
         )
-        self.cohere_service = CohereService(self.config.cohere_api_key)
+        self.cohere_service = CohereService(self.config.cohere_api_key, self.config.cohere_embedding_type)
+
+        # Coalesce concurrent query embeddings into batched Cohere requests
+        self.embedder = BatchedEmbedder(self.cohere_service)
 
         # Initialize the retrieval tool
-        self.retrieval_tool = RetrievalTool(self.qdrant_service, self.cohere_service)
+        self.retrieval_tool = RetrievalTool(self.qdrant_service, self.cohere_service, self.embedder)
 
-        # Configure OpenRouter API
-        self.client = OpenAI(
+        # Initialize the semantic cache for answers to near-duplicate queries
+        self.semantic_cache = SemanticCache(
+            threshold=self.config.semantic_cache_threshold,
+            max_entries=self.config.semantic_cache_size,
+            ttl_seconds=self.config.semantic_cache_ttl
+        )
+
+        # Configure OpenRouter API over a pooled HTTP/2 client so concurrent
+        # completions are multiplexed over already-established connections
+        self.http_client = httpx.AsyncClient(
+            http2=True,
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=50),
+            timeout=httpx.Timeout(30.0, connect=5.0)
+        )
+        self.client = AsyncOpenAI(
             api_key=self.config.openrouter_api_key,
-            base_url="https://openrouter.ai/api/v1"
+            base_url="https://openrouter.ai/api/v1",
+            http_client=self.http_client
         )
         # Initialize the OpenRouter model
         self.model_name = "mistralai/mistral-7b-instruct:free"  # Using a free model from OpenRouter
 
         self.logger.info("AI Agent initialized successfully")
 
-    def generate_answer(self, query: str, context_chunks: List[Dict[str, Any]]) -> str:
+    async def warm_up(self):
+        """
+        Establish the connection to OpenRouter before the first query arrives
+        """
+        try:
+            await self.client.models.list()
+            self.logger.info("OpenRouter connection warmed up")
+        except Exception as e:
+            self.logger.warning(f"Failed to warm up OpenRouter connection: {str(e)}")
+
+    async def aclose(self):
+        """
+        Stop the embedding batcher and close the pooled HTTP connections
+        """
+        await self.embedder.aclose()
+        await self.http_client.aclose()
+
+    async def _embed(self, query: str) -> np.ndarray:
+        """
+        Embed a query once per request, for reuse by the semantic cache and the Qdrant search
+
+        Args:
+            query: The user's query
+
+        Returns:
+            Query embedding as a float32 array
+        """
+        return np.asarray(await self.embedder.embed_one(query), dtype=np.float32)
+
+    async def generate_answer(self, query: str, context_chunks: List[Dict[str, Any]]) -> Tuple[str, bool]:
         """
         Generate an answer based on the query and retrieved context
 
@@ -174,42 +428,17 @@ class AIAgent:
             context_chunks: Retrieved context chunks to ground the response
 
         Returns:
-            Generated answer string
+            Tuple of the answer and whether it is the rate-limit fallback
+            instead of an LLM completion
         """
         self.logger.info(f"Generating answer for query: '{query[:50]}...'")
 
         try:
-            # Construct the prompt with context
-            context_text = ""
-            for i, chunk in enumerate(context_chunks):
-                context_text += f"\n\nContext Chunk {i+1} (Score: {chunk['score']:.3f}, Source: {chunk['source_url']}):\n{chunk['content']}\n"
-
-            # Create a system message that emphasizes using only the provided context
-            system_message = (
-                "You are a helpful AI assistant that answers questions based ONLY on the provided context. "
-                "Do not use any prior knowledge or information not contained in the provided context. "
-                "If the context does not contain information to answer the question, say so explicitly. "
-                "Always cite the sources when providing information."
-            )
-
-            # Create the messages for OpenAI API format
-            messages = [
-                {
-                    "role": "system",
-                    "content": "You are a helpful AI assistant that answers questions based ONLY on the provided context. "
-                               "Do not use any prior knowledge or information not contained in the provided context. "
-                               "If the context does not contain information to answer the question, say so explicitly. "
-                               "Always cite the sources when providing information."
-                },
-                {
-                    "role": "user",
-                    "content": f"Question: {query}\n\nContext:\n{context_text}\n\nAnswer:"
-                }
-            ]
+            messages = self._build_messages(query, context_chunks)
 
             try:
                 # Generate content using OpenRouter API
-                response = self.client.chat.completions.create(
+                response = await self.client.chat.completions.create(
                     model=self.model_name,
                     messages=messages,
                     temperature=0.3,  # Lower temperature for more consistent responses
@@ -217,35 +446,109 @@ class AIAgent:
                 )
 
                 answer = response.choices[0].message.content.strip()
+                fell_back = False
             except Exception as e:
                 # Handle rate limit and other API errors
-                if "429" in str(e) or "rate" in str(e).lower() or "limit" in str(e).lower():
+                if self._is_rate_limit_error(e):
                     # If rate limited, return a response based on the context without LLM
                     self.logger.warning(f"Rate limited by OpenRouter API: {str(e)}")
-                    # Create a simple answer using the retrieved context
-                    if context_chunks:
-                        context_preview = " ".join([chunk['content'][:200] for chunk in context_chunks[:2]])
-                        answer = f"Due to API rate limits, here's a preview of the relevant information I found: {context_preview}... Please try again later for a complete response."
-                    else:
-                        answer = "Due to API rate limits, I cannot generate a full response. The system is working but the LLM service is temporarily unavailable due to usage limits."
+                    answer = self._rate_limited_answer(context_chunks)
+                    fell_back = True
                 else:
                     # For other errors, raise the exception
                     raise e
             self.logger.info(f"Generated answer with {len(answer)} characters")
 
-            return answer
+            return answer, fell_back
 
         except Exception as e:
             self.logger.error(f"Error generating answer for query '{query[:30]}...': {str(e)}")
             raise
 
-    def calculate_grounding_confidence(self, context_chunks: List[Dict[str, Any]], min_score_threshold: float = 0.7) -> float:
+    async def stream_answer(self, query: str, context_chunks: List[Dict[str, Any]]) -> AsyncIterator[Tuple[str, bool]]:
+        """
+        Stream an answer token by token based on the query and retrieved context
+
+        Args:
+            query: The user's query
+            context_chunks: Retrieved context chunks to ground the response
+
+        Yields:
+            Tuples of a text delta as it arrives from the LLM and whether it is
+            the rate-limit fallback instead of an LLM completion
+        """
+        self.logger.info(f"Streaming answer for query: '{query[:50]}...'")
+
+        messages = self._build_messages(query, context_chunks)
+
+        try:
+            stream = await self.client.chat.completions.create(
+                model=self.model_name,
+                messages=messages,
+                temperature=0.3,  # Lower temperature for more consistent responses
+                max_tokens=1000,
+                stream=True
+            )
+        except Exception as e:
+            if not self._is_rate_limit_error(e):
+                self.logger.error(f"Error streaming answer for query '{query[:30]}...': {str(e)}")
+                raise
+            self.logger.warning(f"Rate limited by OpenRouter API: {str(e)}")
+            yield self._rate_limited_answer(context_chunks), True
+            return
+
+        async for chunk in stream:
+            if not chunk.choices:
+                continue
+            delta = chunk.choices[0].delta.content
+            if delta:
+                yield delta, False
+
+    def _build_messages(self, query: str, context_chunks: List[Dict[str, Any]]) -> List[Dict[str, str]]:
+        """Construct the chat messages grounding the query in the retrieved context"""
+        context_text = "".join([
+            f"\n\nContext Chunk {i+1} (Score: {chunk['score']:.3f}, Source: {chunk['source_url']}):\n{chunk['content']}\n"
+            for i, chunk in enumerate(context_chunks)
+        ])
+
+        # Create the messages for OpenAI API format
+        return [
+            {
+                "role": "system",
+                "content": SYSTEM_PROMPT
+            },
+            {
+                "role": "user",
+                "content": f"Question: {query}\n\nContext:\n{context_text}\n\nAnswer:"
+            }
+        ]
+
+    @staticmethod
+    def _is_rate_limit_error(error: Exception) -> bool:
+        message = str(error).lower()
+        return "429" in message or "rate" in message or "limit" in message
+
+    @staticmethod
+    def _rate_limited_answer(context_chunks: List[Dict[str, Any]]) -> str:
+        """Build a fallback answer from the retrieved context when the LLM is rate limited"""
+        if context_chunks:
+            context_preview = " ".join([chunk['content'][:200] for chunk in context_chunks[:2]])
+            return f"Due to API rate limits, here's a preview of the relevant information I found: {context_preview}... Please try again later for a complete response."
+        return "Due to API rate limits, I cannot generate a full response. The system is working but the LLM service is temporarily unavailable due to usage limits."
+
+    def calculate_grounding_confidence(
+        self,
+        context_chunks: List[Dict[str, Any]],
+        min_score_threshold: float = 0.7,
+        scores: Optional[np.ndarray] = None
+    ) -> float:
         """
         Calculate the confidence in how well the response is grounded in the context
 
         Args:
             context_chunks: Retrieved context chunks
             min_score_threshold: Minimum score to consider as high quality
+            scores: Precomputed similarity scores of the chunks, if available
 
         Returns:
             Grounding confidence score between 0.0 and 1.0
@@ -253,12 +556,16 @@ class AIAgent:
         if not context_chunks:
             return 0.0
 
+        if scores is None:
+            scores = np.fromiter(
+                (chunk['score'] for chunk in context_chunks), dtype=np.float64, count=len(context_chunks)
+            )
+
         # Calculate average score
-        avg_score = sum(chunk['score'] for chunk in context_chunks) / len(context_chunks)
+        avg_score = float(scores.mean())
 
         # Calculate percentage of chunks above threshold
-        high_quality_chunks = sum(1 for chunk in context_chunks if chunk['score'] >= min_score_threshold)
-        high_quality_ratio = high_quality_chunks / len(context_chunks)
+        high_quality_ratio = float((scores >= min_score_threshold).mean())
 
         # Combine metrics for overall confidence
         # Weight score average (0.6) and high quality ratio (0.4)
@@ -266,7 +573,13 @@ class AIAgent:
 
         return min(1.0, grounding_confidence)  # Cap at 1.0
 
-    def ask_question(self, query: str, max_chunks: int = 5, min_score: float = 0.5) -> Dict[str, Any]:
+    async def ask_question(
+        self,
+        query: str,
+        max_chunks: int = 5,
+        min_score: float = 0.5,
+        hnsw_ef: Optional[int] = None
+    ) -> Dict[str, Any]:
         """
         Process a user question through the RAG pipeline
 
@@ -274,39 +587,47 @@ class AIAgent:
             query: The user's question
             max_chunks: Maximum number of chunks to retrieve
             min_score: Minimum similarity score for inclusion
+            hnsw_ef: HNSW beam width for the vector search
 
         Returns:
             Dictionary containing the answer, sources, and metadata
         """
         self.logger.info(f"Processing question: '{query[:50]}...'")
 
-        start_time = datetime.now()
+        start_time = time.perf_counter()
 
         try:
+            # Step 0: Embed the query once and check the semantic cache
+            query_embedding = await self._embed(query)
+            cache_key = (max_chunks, min_score, hnsw_ef)
+
+            cached_response = self.semantic_cache.lookup(query_embedding, cache_key)
+            if cached_response is not None:
+                self.logger.info(f"Semantic cache hit for question: '{query[:50]}...'")
+                return {
+                    **cached_response,
+                    'query': query,
+                    'timestamp': datetime.now().isoformat()
+                }
+
             # Step 1: Retrieve relevant context
-            retrieval_result = self.retrieval_tool.retrieve_context(
-                query, max_chunks=max_chunks, min_score=min_score
+            retrieval_result = await self.retrieval_tool.retrieve_context(
+                query, max_chunks=max_chunks, min_score=min_score, query_embedding=query_embedding, hnsw_ef=hnsw_ef
             )
 
-            # Step 2: Generate answer based on context
-            answer = self.generate_answer(query, retrieval_result['chunks'])
-
-            # Step 3: Calculate grounding confidence
+            # Step 2: Calculate grounding confidence from the retrieval scores
             grounding_confidence = self.calculate_grounding_confidence(
-                retrieval_result['chunks']
+                retrieval_result['chunks'], scores=retrieval_result['scores']
             )
 
+            # Step 3: Generate answer based on context
+            answer, fell_back = await self.generate_answer(query, retrieval_result['chunks'])
+
             # Step 4: Format sources
-            sources = []
-            for chunk in retrieval_result['chunks']:
-                sources.append(SourceInfo(
-                    source_url=chunk['source_url'],
-                    similarity_score=chunk['score'],
-                    content=chunk['content'][:200] + "..." if len(chunk['content']) > 200 else chunk['content']
-                ))
+            sources = self._format_sources(retrieval_result['chunks'])
 
             # Step 5: Calculate total processing time
-            total_processing_time = (datetime.now() - start_time).total_seconds()
+            total_processing_time = time.perf_counter() - start_time
 
             # Prepare response
             response = {
@@ -322,6 +643,10 @@ class AIAgent:
                 'timestamp': datetime.now().isoformat()
             }
 
+            # A rate-limit fallback must not be served to similar queries for the whole TTL
+            if not fell_back:
+                self.semantic_cache.add(query_embedding, response, cache_key)
+
             self.logger.info(f"Processed question successfully in {total_processing_time:.2f}s")
             return response
 
@@ -329,41 +654,163 @@ class AIAgent:
             self.logger.error(f"Error processing question '{query[:30]}...': {str(e)}")
             raise
 
+    async def ask_question_stream(
+        self,
+        query: str,
+        max_chunks: int = 5,
+        min_score: float = 0.5,
+        hnsw_ef: Optional[int] = None
+    ) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+        """
+        Process a user question through the RAG pipeline, streaming the answer
+
+        Yields ``(event, data)`` pairs: a single ``sources`` event carrying the
+        sources, retrieval info and grounding confidence, then one ``token``
+        event per answer delta, and finally a ``done`` event.
+
+        Args:
+            query: The user's question
+            max_chunks: Maximum number of chunks to retrieve
+            min_score: Minimum similarity score for inclusion
+            hnsw_ef: HNSW beam width for the vector search
+        """
+        self.logger.info(f"Processing streamed question: '{query[:50]}...'")
+
+        start_time = time.perf_counter()
+
+        query_embedding = await self._embed(query)
+        cache_key = (max_chunks, min_score, hnsw_ef)
+
+        cached_response = self.semantic_cache.lookup(query_embedding, cache_key)
+        if cached_response is not None:
+            self.logger.info(f"Semantic cache hit for streamed question: '{query[:50]}...'")
+            yield 'sources', self._sources_event(cached_response)
+            yield 'token', {'text': cached_response['answer']}
+            yield 'done', {'timestamp': datetime.now().isoformat()}
+            return
+
+        retrieval_result = await self.retrieval_tool.retrieve_context(
+            query, max_chunks=max_chunks, min_score=min_score, query_embedding=query_embedding, hnsw_ef=hnsw_ef
+        )
+        grounding_confidence = self.calculate_grounding_confidence(
+            retrieval_result['chunks'], scores=retrieval_result['scores']
+        )
+
+        response = {
+            'query': query,
+            'answer': '',
+            'sources': self._format_sources(retrieval_result['chunks']),
+            'retrieval_info': RetrievalInfo(
+                chunks_count=retrieval_result['total_retrieved'],
+                avg_similarity=retrieval_result['avg_similarity'],
+                processing_time=retrieval_result['processing_time']
+            ),
+            'grounding_confidence': grounding_confidence,
+            'timestamp': None
+        }
+        yield 'sources', self._sources_event(response)
+
+        answer_parts = []
+        fell_back = False
+        async for delta, is_fallback in self.stream_answer(query, retrieval_result['chunks']):
+            answer_parts.append(delta)
+            fell_back = fell_back or is_fallback
+            yield 'token', {'text': delta}
+
+        response['answer'] = "".join(answer_parts).strip()
+        response['timestamp'] = datetime.now().isoformat()
+        if not fell_back:
+            self.semantic_cache.add(query_embedding, response, cache_key)
+
+        total_processing_time = time.perf_counter() - start_time
+        self.logger.info(f"Streamed question successfully in {total_processing_time:.2f}s")
+        yield 'done', {'timestamp': response['timestamp']}
+
+    @staticmethod
+    def _format_sources(context_chunks: List[Dict[str, Any]]) -> List[SourceInfo]:
+        return SOURCES_ADAPTER.validate_python([
+            {
+                'source_url': chunk['source_url'],
+                'similarity_score': chunk['score'],
+                'content': chunk['preview']
+            }
+            for chunk in context_chunks
+        ])
+
+    @staticmethod
+    def _sources_event(response: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            'sources': SOURCES_ADAPTER.dump_python(response['sources'], mode='json'),
+            'retrieval_info': response['retrieval_info'].model_dump(mode='json'),
+            'grounding_confidence': response['grounding_confidence']
+        }
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Create the AI agent on startup and release its connections on shutdown
+
+    The agent is built here rather than at import time so importing the
+    module (e.g. on every reload) does not construct the service clients.
+    """
+    app.state.ready = False
+    app.state.agent = AIAgent()
+    await app.state.agent.warm_up()
+    app.state.ready = True
+    try:
+        yield
+    finally:
+        app.state.ready = False
+        await app.state.agent.aclose()
+
 
 # Initialize FastAPI app
 app = FastAPI(
     title="AI Agent with Retrieval Integration API",
     description="API for AI agent with retrieval-augmented generation capabilities",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
-# Initialize the AI agent
-ai_agent = AIAgent()
 
+def get_agent(http_request: Request) -> AIAgent:
+    """
+    Return the AI agent created by the lifespan handler
+    """
+    if not getattr(http_request.app.state, "ready", False):
+        raise HTTPException(status_code=503, detail="AI agent is not ready")
+    return http_request.app.state.agent
 
-@app.post("/ask", response_model=AgentQueryResponse)
-async def ask_endpoint(request: AgentQueryRequest):
+
+@app.post("/ask", response_model=None, responses={200: {"model": AgentQueryResponse}})
+async def ask_endpoint(request: AgentQueryRequest, http_request: Request):
     """
     Endpoint to ask a question to the AI agent
 
     Args:
         request: Query request with parameters
+        http_request: The incoming HTTP request, used to reach the app state
 
     Returns:
         Response with answer and sources
     """
     logger.info(f"Received query via API: '{request.query[:50]}...'")
 
+    ai_agent = get_agent(http_request)
+
     try:
         # Process the query through the agent
-        result = ai_agent.ask_question(
+        result = await ai_agent.ask_question(
             query=request.query,
             max_chunks=request.max_chunks,
-            min_score=request.min_score
+            min_score=request.min_score,
+            hnsw_ef=request.hnsw_ef
         )
 
-        # Convert to response model
-        response = AgentQueryResponse(
+        # The fields are already validated (sources and retrieval info are model
+        # instances), so build the response model without re-running validation
+        response = AgentQueryResponse.model_construct(
             query=result['query'],
             answer=result['answer'],
             sources=result['sources'],
@@ -373,20 +820,60 @@ async def ask_endpoint(request: AgentQueryRequest):
         )
 
         logger.info(f"API query processed successfully")
-        return response
+        # Serialize directly with pydantic-core; response_model=None skips FastAPI's validation pass
+        return Response(content=response.model_dump_json(), media_type="application/json")
 
     except Exception as e:
         logger.error(f"Error processing API query: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Error processing query: {str(e)}")
 
 
+@app.post("/ask/stream")
+async def ask_stream_endpoint(request: AgentQueryRequest, http_request: Request):
+    """
+    Endpoint to ask a question to the AI agent, streaming the answer as
+    Server-Sent Events
+
+    Args:
+        request: Query request with parameters
+        http_request: The incoming HTTP request, used to reach the app state
+
+    Returns:
+        ``text/event-stream`` response with ``sources``, ``token`` and ``done`` events
+    """
+    logger.info(f"Received streaming query via API: '{request.query[:50]}...'")
+
+    ai_agent = get_agent(http_request)
+
+    async def event_stream():
+        try:
+            async for event, data in ai_agent.ask_question_stream(
+                query=request.query,
+                max_chunks=request.max_chunks,
+                min_score=request.min_score,
+                hnsw_ef=request.hnsw_ef
+            ):
+                yield f"event: {event}\ndata: {json.dumps(data)}\n\n"
+        except Exception as e:
+            logger.error(f"Error processing streaming API query: {str(e)}")
+            error = {'detail': f"Error processing query: {str(e)}"}
+            yield f"event: error\ndata: {json.dumps(error)}\n\n"
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
 @app.get("/health")
-async def health_check():
+async def health_check(http_request: Request):
     """
     Health check endpoint
     """
     return {
         "status": "healthy",
+        "ready": getattr(http_request.app.state, "ready", False),
         "timestamp": datetime.now().isoformat(),
         "service": "AI Agent with Retrieval Integration"
     }
@@ -1,19 +1,65 @@
+import asyncio
 import cohere
-from typing import List
+import numpy as np
+from collections import OrderedDict
+from typing import List, Optional, Set, Tuple
 import logging
+import threading
 
 logger = logging.getLogger(__name__)
 
+# Cohere's uint8 embeddings are int8 embeddings shifted up by this much
+UINT8_OFFSET = 128
+
 class CohereService:
     """Service for interacting with Cohere API for embeddings"""
 
-    def __init__(self, api_key: str):
+    def __init__(self, api_key: str, embedding_type: str = "float", cache_size: int = 1024):
         """
         Initialize Cohere service with API key
+
+        embedding_type "uint8" requests compact 8-bit embeddings from the v3
+        model instead of float embeddings from v2; they are decoded back to
+        zero-centred floats, so cosine similarity works on them as on float
+        embeddings and Qdrant's scalar quantization keeps them compact in
+        storage. cache_size is the number of
+        single-text embeddings kept, so repeated queries skip the API call
+        (0 disables).
         """
         self.client = cohere.Client(api_key)
-        # Using the multilingual v3 embedding model which has 1024 dimensions
-        self.model = "embed-multilingual-v2.0"
+        # Async client for the request path so embeddings don't block the event loop
+        self.async_client = cohere.AsyncClient(api_key)
+        self.embedding_type = embedding_type
+        if embedding_type == "float":
+            self.model = "embed-multilingual-v2.0"
+        else:
+            # Typed embeddings are only available on the v3 models (1024 dimensions)
+            self.model = "embed-multilingual-v3.0"
+
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[str, List[float]]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+
+    def _embed_kwargs(self) -> dict:
+        """
+        Get the model and embedding type arguments for an embed request
+        """
+        kwargs = {"model": self.model, "input_type": "search_document"}
+        if self.embedding_type != "float":
+            kwargs["embedding_types"] = [self.embedding_type]
+        return kwargs
+
+    def _extract_embeddings(self, response) -> List[List[float]]:
+        """
+        Get the embeddings of the configured type from an embed response
+        """
+        if self.embedding_type == "float":
+            return response.embeddings
+
+        # Undo the uint8 shift, otherwise every component is non-negative and
+        # unrelated texts score a cosine similarity close to 1
+        embeddings = np.asarray(getattr(response.embeddings, self.embedding_type), dtype=np.float32)
+        return ((embeddings - UINT8_OFFSET) / UINT8_OFFSET).tolist()
 
     def generate_embeddings(
         self,
@@ -31,10 +77,9 @@ class CohereService:
             try:
                 response = self.client.embed(
                     texts=batch,
-                    model=self.model,
-                    input_type="search_document"
+                    **self._embed_kwargs()
                 )
-                all_embeddings.extend(response.embeddings)
+                all_embeddings.extend(self._extract_embeddings(response))
                 logger.info(f"Generated embeddings for batch {i//batch_size + 1}/{(len(texts)-1)//batch_size + 1}")
             except Exception as e:
                 logger.error(f"Error generating embeddings for batch: {str(e)}")
@@ -46,25 +91,105 @@ class CohereService:
         """
         Generate embedding for a single text
         """
+        embedding = self.get_cached_embedding(text)
+        if embedding is not None:
+            return embedding
+
         try:
             response = self.client.embed(
                 texts=[text],
-                model=self.model,
-                input_type="search_document"
+                **self._embed_kwargs()
+            )
+            return self.remember_embedding(text, self._extract_embeddings(response)[0])
+        except Exception as e:
+            logger.error(f"Error generating embedding for text: {str(e)}")
+            raise
+
+    async def generate_embeddings_async(
+        self,
+        texts: List[str],
+        batch_size: int = 96  # Cohere's recommended batch size
+    ) -> List[List[float]]:
+        """
+        Generate embeddings for several texts without blocking the event loop
+
+        Texts are sent in batches of at most batch_size, issued concurrently.
+        """
+        async def embed_batch(batch: List[str]) -> List[List[float]]:
+            try:
+                response = await self.async_client.embed(
+                    texts=batch,
+                    **self._embed_kwargs()
+                )
+                return self._extract_embeddings(response)
+            except Exception as e:
+                logger.error(f"Error generating embeddings for batch: {str(e)}")
+                raise
+
+        batches = await asyncio.gather(*[
+            embed_batch(texts[i:i + batch_size]) for i in range(0, len(texts), batch_size)
+        ])
+        return [embedding for batch in batches for embedding in batch]
+
+    async def generate_single_embedding_async(self, text: str) -> List[float]:
+        """
+        Generate embedding for a single text without blocking the event loop
+        """
+        embedding = self.get_cached_embedding(text)
+        if embedding is not None:
+            return embedding
+
+        try:
+            response = await self.async_client.embed(
+                texts=[text],
+                **self._embed_kwargs()
             )
-            return response.embeddings[0]
+            return self.remember_embedding(text, self._extract_embeddings(response)[0])
         except Exception as e:
             logger.error(f"Error generating embedding for text: {str(e)}")
             raise
 
+    def get_cached_embedding(self, text: str) -> Optional[List[float]]:
+        """
+        Get a previously generated embedding for text, marking it recently used
+        """
+        if self.cache_size <= 0:
+            return None
+
+        with self._cache_lock:
+            embedding = self._cache.get(text)
+            if embedding is not None:
+                self._cache.move_to_end(text)
+            return embedding
+
+    def remember_embedding(self, text: str, embedding: List[float]) -> List[float]:
+        """
+        Store an embedding for text, evicting the least recently used one when full
+        """
+        if self.cache_size > 0:
+            with self._cache_lock:
+                self._cache[text] = embedding
+                if len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+        return embedding
+
     def get_model_info(self) -> dict:
         """
         Get information about the embedding model being used
         """
+        if self.embedding_type == "float":
+            return {
+                "model": self.model,
+                "dimensions": 768,  # Cohere multilingual v2 model has 768 dimensions
+                "datatype": "float32",
+                "description": "Cohere multilingual embedding model v2.0"
+            }
+
         return {
             "model": self.model,
-            "dimensions": 768,  # Cohere multilingual v2 model has 768 dimensions
-            "description": "Cohere multilingual embedding model v2.0"
+            "dimensions": 1024,  # Cohere multilingual v3 model has 1024 dimensions
+            "datatype": "float32",
+            "description": f"Cohere multilingual embedding model v3.0 ({self.embedding_type} embeddings)"
         }
 
     def validate_text_for_embedding(self, text: str) -> bool:
@@ -80,4 +205,126 @@ class CohereService:
             logger.warning(f"Text length ({len(text)}) exceeds recommended limit for embedding")
             return False
 
-        return True
\ No newline at end of file
+        return True
+
+
+class BatchedEmbedder:
+    """
+    Coalesce concurrent single-text embedding requests into batched Cohere calls
+
+    Requests wait in a shared queue for up to max_wait_ms (or until the batch
+    holds max_batch_size texts); a background worker then issues one embed
+    call for the whole batch and resolves each caller's future.
+    """
+
+    def __init__(self, cohere_service: CohereService, max_batch_size: int = 96, max_wait_ms: float = 20.0):
+        """
+        Initialize the batched embedder
+        """
+        self.cohere_service = cohere_service
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._dispatches: Set[asyncio.Task] = set()
+
+    async def embed_one(self, text: str) -> List[float]:
+        """
+        Generate embedding for a single text, batched with other concurrent requests
+        """
+        embedding = self.cohere_service.get_cached_embedding(text)
+        if embedding is not None:
+            return embedding
+
+        self._ensure_worker()
+        future = self._loop.create_future()
+        await self._queue.put((text, future))
+        return await future
+
+    def _ensure_worker(self):
+        """
+        Start the background worker on the running event loop if needed
+        """
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop or self._worker is None or self._worker.done():
+            self._loop = loop
+            self._queue = asyncio.Queue()
+            self._worker = loop.create_task(self._run())
+
+    async def _run(self):
+        """
+        Collect queued requests into batches and dispatch them
+        """
+        while True:
+            batch = [await self._queue.get()]
+            deadline = self._loop.time() + self.max_wait
+
+            try:
+                while len(batch) < self.max_batch_size:
+                    timeout = deadline - self._loop.time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                    except asyncio.TimeoutError:
+                        break
+            except asyncio.CancelledError:
+                # Closed while collecting; this batch will never be dispatched
+                self._fail(batch, RuntimeError("BatchedEmbedder was closed"))
+                raise
+
+            # Dispatch without blocking collection of the next batch
+            task = self._loop.create_task(self._dispatch(batch))
+            self._dispatches.add(task)
+            task.add_done_callback(self._dispatches.discard)
+
+    async def _dispatch(self, batch: List[Tuple[str, asyncio.Future]]):
+        """
+        Embed a batch of texts and fan the results back to the waiting callers
+        """
+        try:
+            embeddings = await self.cohere_service.generate_embeddings_async([text for text, _ in batch])
+        except Exception as e:
+            self._fail(batch, e)
+            return
+
+        logger.debug(f"Generated {len(embeddings)} embeddings in one batched request")
+        for (text, future), embedding in zip(batch, embeddings):
+            self.cohere_service.remember_embedding(text, embedding)
+            if not future.done():
+                future.set_result(embedding)
+
+    @staticmethod
+    def _fail(batch: List[Tuple[str, asyncio.Future]], error: BaseException):
+        """
+        Raise an error to every caller of a batch still waiting for its embedding
+        """
+        for _, future in batch:
+            if not future.done():
+                future.set_exception(error)
+
+    async def aclose(self):
+        """
+        Stop the background worker
+
+        Requests still queued fail with RuntimeError; batches already sent to
+        Cohere are waited for, so their callers get their embeddings.
+        """
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+
+        if self._queue is not None:
+            queued = []
+            while not self._queue.empty():
+                queued.append(self._queue.get_nowait())
+            self._fail(queued, RuntimeError("BatchedEmbedder was closed"))
+            self._queue = None
+
+        if self._dispatches:
+            await asyncio.gather(*self._dispatches, return_exceptions=True)
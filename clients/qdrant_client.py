@@ -1,19 +1,76 @@
-from qdrant_client import QdrantClient
+from qdrant_client import QdrantClient, AsyncQdrantClient
 from qdrant_client.http import models
-from typing import List, Dict, Any, Optional
+from models.embedding_batch import EmbeddingRecordBatch
+from typing import List, Dict, Any, Optional, Set, Tuple
+import asyncio
 import logging
+import time
 
 logger = logging.getLogger(__name__)
 
+# How long the list of existing collections is trusted before asking Qdrant again
+COLLECTIONS_CACHE_TTL = 30.0
+
+# Points per upsert request and requests in flight for concurrent ingestion uploads
+UPSERT_BATCH_SIZE = 64
+UPSERT_MAX_CONCURRENCY = 8
+
+# Candidate oversampling factor used when rescoring quantized search results
+QUANTIZATION_OVERSAMPLING = {
+    "scalar": 2.0,
+    "binary": 4.0
+}
+
 class QdrantService:
     """Service for interacting with Qdrant vector database"""
 
-    def __init__(self, url: str, api_key: str, collection_name: str):
+    def __init__(
+        self,
+        url: str,
+        api_key: str,
+        collection_name: str,
+        quantization_mode: str = "scalar",
+        prefer_grpc: bool = True,
+        grpc_port: int = 6334
+    ):
         """
         Initialize Qdrant service with connection parameters
+
+        quantization_mode is one of "none", "scalar" (int8) or "binary".
+        prefer_grpc sends vectors as packed protobuf floats over one multiplexed
+        HTTP/2 connection instead of JSON; pass False where the gRPC port is not
+        reachable.
         """
-        self.client = QdrantClient(url=url, api_key=api_key)
+        connection_params = {
+            "url": url,
+            "api_key": api_key,
+            "prefer_grpc": prefer_grpc,
+            "grpc_port": grpc_port
+        }
+        self._connection_params = connection_params
+        self.client = QdrantClient(**connection_params)
+        # Async client for the request path so searches don't block the event loop
+        self.async_client = AsyncQdrantClient(**connection_params)
         self.collection_name = collection_name
+        self.quantization_mode = quantization_mode
+
+        # Source URLs known to be stored, so repeated existence checks skip the scroll request
+        self._known_urls: Set[str] = set()
+        # (fetched_at, collection names) from the last get_collections call
+        self._collections_cache: Optional[Tuple[float, Set[str]]] = None
+
+    def _get_collection_names(self) -> Set[str]:
+        """
+        Get the names of existing collections, cached for a short TTL
+        """
+        now = time.monotonic()
+        if self._collections_cache is not None and now - self._collections_cache[0] < COLLECTIONS_CACHE_TTL:
+            return self._collections_cache[1]
+
+        collections = self.client.get_collections()
+        names = {collection.name for collection in collections.collections}
+        self._collections_cache = (now, names)
+        return names
 
     def create_collection_if_not_exists(
         self,
@@ -25,11 +82,7 @@ class QdrantService:
         """
         try:
             # Check if collection exists
-            collections = self.client.get_collections()
-            collection_exists = any(
-                collection.name == self.collection_name
-                for collection in collections.collections
-            )
+            collection_exists = self.collection_name in self._get_collection_names()
 
             if not collection_exists:
                 # Create collection with specified vector size
@@ -40,7 +93,8 @@ class QdrantService:
                     vectors_config=models.VectorParams(
                         size=vector_size,
                         distance=distance_enum
-                    )
+                    ),
+                    quantization_config=self._quantization_config()
                 )
 
                 # Create index for source_url field to enable filtering
@@ -50,6 +104,9 @@ class QdrantService:
                     field_schema=models.PayloadSchemaType.KEYWORD
                 )
 
+                if self._collections_cache is not None:
+                    self._collections_cache[1].add(self.collection_name)
+
                 logger.info(f"Created Qdrant collection: {self.collection_name}")
                 return True
             else:
@@ -70,21 +127,14 @@ class QdrantService:
         Upsert (insert or update) vectors in the collection
         """
         try:
-            # Prepare points for upsert
-            points = []
-            for i, (vector_id, vector, payload) in enumerate(zip(vector_ids, vectors, payloads)):
-                point = models.PointStruct(
-                    id=vector_id,
-                    vector=vector,
-                    payload=payload
-                )
-                points.append(point)
+            points = self._build_points(vector_ids, vectors, payloads)
 
             # Upsert the points
             self.client.upsert(
                 collection_name=self.collection_name,
                 points=points
             )
+            self._remember_urls(payloads)
 
             logger.info(f"Upserted {len(points)} vectors to collection {self.collection_name}")
             return True
@@ -93,44 +143,264 @@ class QdrantService:
             logger.error(f"Error upserting vectors to Qdrant: {str(e)}")
             raise
 
+    def upsert_batch(
+        self,
+        batch: EmbeddingRecordBatch,
+        batch_size: int = UPSERT_BATCH_SIZE,
+        max_concurrency: int = UPSERT_MAX_CONCURRENCY
+    ) -> bool:
+        """
+        Upsert a column-wise batch in requests of batch_size points, up to max_concurrency in flight
+
+        Each request carries the batch's float32 matrix slice as a Qdrant Batch
+        rather than one PointStruct per record.
+
+        This is a blocking call for the ingestion pipeline: the concurrent requests
+        run on their own event loop via asyncio.run. Called from a running event
+        loop, it cannot start one, so the requests are sent one after another
+        instead; async code should run it in a thread with asyncio.to_thread.
+        """
+        if len(batch) > batch_size and not self._in_event_loop():
+            return asyncio.run(self._upsert_batches_async(batch, batch_size, max_concurrency))
+
+        try:
+            for start in range(0, len(batch), batch_size):
+                self.client.upsert(
+                    collection_name=self.collection_name,
+                    points=self._to_qdrant_batch(batch.slice(start, start + batch_size))
+                )
+            self._remember_urls(batch.payloads)
+
+            logger.info(f"Upserted {len(batch)} vectors to collection {self.collection_name}")
+            return True
+
+        except Exception as e:
+            logger.error(f"Error upserting vectors to Qdrant: {str(e)}")
+            raise
+
+    @staticmethod
+    def _in_event_loop() -> bool:
+        """Check whether this thread is running an event loop, where asyncio.run would fail"""
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return False
+        return True
+
+    async def _upsert_batches_async(
+        self,
+        batch: EmbeddingRecordBatch,
+        batch_size: int,
+        max_concurrency: int
+    ) -> bool:
+        """
+        Submit upsert requests concurrently over a client scoped to the running loop
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+        # self.async_client belongs to the long-lived request loop; asyncio.run gets its own
+        client = AsyncQdrantClient(**self._connection_params)
+
+        async def upsert_slice(start: int):
+            points = self._to_qdrant_batch(batch.slice(start, start + batch_size))
+            async with semaphore:
+                await client.upsert(collection_name=self.collection_name, points=points)
+
+        try:
+            await asyncio.gather(*(upsert_slice(start) for start in range(0, len(batch), batch_size)))
+            self._remember_urls(batch.payloads)
+
+            logger.info(
+                f"Upserted {len(batch)} vectors to collection {self.collection_name} "
+                f"in batches of {batch_size}"
+            )
+            return True
+
+        except Exception as e:
+            logger.error(f"Error upserting vectors to Qdrant: {str(e)}")
+            raise
+
+        finally:
+            await client.close()
+
+    @staticmethod
+    def _to_qdrant_batch(batch: EmbeddingRecordBatch) -> models.Batch:
+        """
+        Convert a column-wise batch to Qdrant's Batch structure
+        """
+        return models.Batch(ids=batch.ids, vectors=batch.vectors, payloads=batch.payloads)
+
+    def _remember_urls(self, payloads: List[Dict[str, Any]]):
+        """
+        Record the source URLs of stored payloads as existing
+        """
+        self._known_urls.update(
+            payload['source_url'] for payload in payloads if payload.get('source_url')
+        )
+
+    def _build_points(
+        self,
+        vector_ids: List[str],
+        vectors: List[List[float]],
+        payloads: List[Dict[str, Any]]
+    ) -> List[models.PointStruct]:
+        """
+        Prepare points for upsert
+        """
+        return [
+            models.PointStruct(id=vector_id, vector=vector, payload=payload)
+            for vector_id, vector, payload in zip(vector_ids, vectors, payloads)
+        ]
+
     def search_similar(
         self,
         query_vector: List[float],
-        limit: int = 10
+        limit: int = 10,
+        hnsw_ef: Optional[int] = None
     ) -> List[Dict[str, Any]]:
         """
         Search for similar vectors in the collection
+
+        hnsw_ef bounds the number of HNSW candidates visited per query; None
+        keeps the collection default.
         """
         try:
-            from qdrant_client.http import models
             results = self.client.query_points(
                 collection_name=self.collection_name,
                 query=query_vector,
-                limit=limit
+                limit=limit,
+                search_params=self._search_params(hnsw_ef)
             )
+            return self._format_search_results(results)
 
-            # Extract payload data from results
-            search_results = []
-            for result in results.points:
-                search_results.append({
-                    "id": result.id,
-                    "score": getattr(result, 'score', 0),  # Use getattr to handle different result formats
-                    "payload": result.payload
-                })
+        except Exception as e:
+            logger.error(f"Error searching in Qdrant: {str(e)}")
+            raise
 
-            return search_results
+    async def search_similar_async(
+        self,
+        query_vector: List[float],
+        limit: int = 10,
+        hnsw_ef: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Search for similar vectors in the collection without blocking the event loop
+        """
+        try:
+            results = await self.async_client.query_points(
+                collection_name=self.collection_name,
+                query=query_vector,
+                limit=limit,
+                search_params=self._search_params(hnsw_ef)
+            )
+            return self._format_search_results(results)
 
         except Exception as e:
             logger.error(f"Error searching in Qdrant: {str(e)}")
             raise
 
-    def get_vector_count(self) -> int:
+    def search_batch(
+        self,
+        query_vectors: List[List[float]],
+        limit: int = 10,
+        hnsw_ef: Optional[int] = None
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        Search for several query vectors in a single request
+
+        Returns one result list per query vector, in the same order.
+        """
+        if not query_vectors:
+            return []
+
+        search_params = self._search_params(hnsw_ef)
+        try:
+            responses = self.client.query_batch_points(
+                collection_name=self.collection_name,
+                requests=[
+                    models.QueryRequest(
+                        query=query_vector,
+                        limit=limit,
+                        params=search_params,
+                        with_payload=True
+                    )
+                    for query_vector in query_vectors
+                ]
+            )
+            return [self._format_search_results(response) for response in responses]
+
+        except Exception as e:
+            logger.error(f"Error batch searching in Qdrant: {str(e)}")
+            raise
+
+    def _quantization_config(self) -> Optional[models.QuantizationConfig]:
+        """
+        Build the collection quantization config for the configured mode
+        """
+        if self.quantization_mode == "binary":
+            # 1-bit document vectors scored against a higher precision query encoding
+            return models.BinaryQuantization(
+                binary=models.BinaryQuantizationConfig(
+                    always_ram=True,
+                    query_encoding=models.BinaryQuantizationQueryEncoding.SCALAR8BITS
+                )
+            )
+
+        if self.quantization_mode == "scalar":
+            # Keep int8 copies of the vectors in RAM for faster HNSW traversal
+            return models.ScalarQuantization(
+                scalar=models.ScalarQuantizationConfig(
+                    type=models.ScalarType.INT8,
+                    quantile=0.99,
+                    always_ram=True
+                )
+            )
+
+        return None
+
+    def _search_params(self, hnsw_ef: Optional[int] = None) -> Optional[models.SearchParams]:
+        """
+        Build query-time search params
+
+        Searches on quantized vectors, then rescores an oversampled candidate
+        set with full precision, and caps the HNSW beam width at hnsw_ef.
+        """
+        oversampling = QUANTIZATION_OVERSAMPLING.get(self.quantization_mode)
+        if oversampling is None and hnsw_ef is None:
+            return None
+
+        quantization = None
+        if oversampling is not None:
+            quantization = models.QuantizationSearchParams(
+                ignore=False,
+                rescore=True,
+                oversampling=oversampling
+            )
+
+        return models.SearchParams(hnsw_ef=hnsw_ef, quantization=quantization)
+
+    def _format_search_results(self, results: models.QueryResponse) -> List[Dict[str, Any]]:
+        """
+        Extract payload data from query results
+        """
+        return [
+            {
+                "id": result.id,
+                "score": getattr(result, 'score', 0),  # Use getattr to handle different result formats
+                "payload": result.payload
+            }
+            for result in results.points
+        ]
+
+    def get_vector_count(self, exact: bool = True) -> int:
         """
         Get the total number of vectors in the collection
+
+        exact=False returns Qdrant's cheap estimate instead of a full count.
         """
         try:
             count = self.client.count(
-                collection_name=self.collection_name
+                collection_name=self.collection_name,
+                exact=exact
             )
             return count.count
         except Exception as e:
@@ -141,30 +411,43 @@ class QdrantService:
         """
         Check if a document with the given source URL already exists in the collection
         """
+        if source_url in self._known_urls:
+            return True
+
         try:
             records, _ = self.client.scroll(
                 collection_name=self.collection_name,
-                scroll_filter=models.Filter(
-                    must=[
-                        models.FieldCondition(
-                            key="source_url",
-                            match=models.MatchValue(value=source_url)
-                        )
-                    ]
-                ),
+                scroll_filter=self._source_url_filter(source_url),
                 limit=1
             )
+            if records:
+                self._known_urls.add(source_url)
             return len(records) > 0
         except Exception as e:
             logger.error(f"Error checking document existence in Qdrant: {str(e)}")
             return False
 
+    def _source_url_filter(self, source_url: str) -> models.Filter:
+        """
+        Build a filter matching points with the given source URL
+        """
+        return models.Filter(
+            must=[
+                models.FieldCondition(
+                    key="source_url",
+                    match=models.MatchValue(value=source_url)
+                )
+            ]
+        )
+
     def delete_collection(self) -> bool:
         """
         Delete the entire collection (use with caution!)
         """
         try:
             self.client.delete_collection(self.collection_name)
+            self._known_urls.clear()
+            self._collections_cache = None
             logger.info(f"Deleted Qdrant collection: {self.collection_name}")
             return True
         except Exception as e:
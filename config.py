@@ -15,6 +15,7 @@ class Config:
 
     # Cohere configuration
     cohere_api_key: str = os.getenv("COHERE_API_KEY", "")
+    cohere_embedding_type: str = os.getenv("COHERE_EMBEDDING_TYPE", "float").lower()
 
     # OpenAI configuration
     openai_api_key: str = os.getenv("OPENAI_API_KEY", "")
@@ -26,12 +27,23 @@ class Config:
     qdrant_url: str = os.getenv("QDRANT_URL", "")
     qdrant_api_key: str = os.getenv("QDRANT_API_KEY", "")
     qdrant_collection_name: str = os.getenv("QDRANT_COLLECTION_NAME", "docusaurus_chunks")
+    qdrant_quantization: str = os.getenv("QDRANT_QUANTIZATION", "scalar").lower()
+    qdrant_prefer_grpc: bool = os.getenv("QDRANT_PREFER_GRPC", "true").lower() == "true"
+    qdrant_grpc_port: int = int(os.getenv("QDRANT_GRPC_PORT", "6334"))
 
     # Ingestion pipeline configuration
     chunk_size: int = int(os.getenv("CHUNK_SIZE", "1000"))
     chunk_overlap: int = int(os.getenv("CHUNK_OVERLAP", "100"))
     crawl_delay: float = float(os.getenv("CRAWL_DELAY", "1.0"))
     max_depth: int = int(os.getenv("MAX_DEPTH", "5"))
+    # Skip ingestion at startup when the collection already holds at least this many vectors
+    min_expected_chunks: int = int(os.getenv("MIN_EXPECTED_CHUNKS", "1"))
+    force_reingest: bool = os.getenv("FORCE_REINGEST", "false").lower() == "true"
+
+    # Semantic cache configuration
+    semantic_cache_threshold: float = float(os.getenv("SEMANTIC_CACHE_THRESHOLD", "0.95"))
+    semantic_cache_size: int = int(os.getenv("SEMANTIC_CACHE_SIZE", "256"))
+    semantic_cache_ttl: float = float(os.getenv("SEMANTIC_CACHE_TTL", "3600"))
 
     def validate(self) -> list[str]:
         """Validate configuration and return list of validation errors"""
@@ -43,6 +55,9 @@ class Config:
         if not self.cohere_api_key:
             errors.append("COHERE_API_KEY environment variable is required")
 
+        if self.cohere_embedding_type not in ("float", "uint8"):
+            errors.append("COHERE_EMBEDDING_TYPE must be one of: float, uint8")
+
         # Either OpenAI or OpenRouter API key is required
         if not self.openai_api_key and not self.openrouter_api_key:
             errors.append("Either OPENAI_API_KEY or OPENROUTER_API_KEY environment variable is required")
@@ -54,6 +69,9 @@ class Config:
         if not self.qdrant_api_key and 'cloud' in self.qdrant_url.lower():
             errors.append("QDRANT_API_KEY environment variable is required for cloud instances")
 
+        if self.qdrant_quantization not in ("none", "scalar", "binary"):
+            errors.append("QDRANT_QUANTIZATION must be one of: none, scalar, binary")
+
         if self.chunk_size <= 0:
             errors.append("CHUNK_SIZE must be a positive integer")
 
@@ -66,6 +84,18 @@ class Config:
         if self.max_depth <= 0:
             errors.append("MAX_DEPTH must be a positive integer")
 
+        if self.min_expected_chunks < 0:
+            errors.append("MIN_EXPECTED_CHUNKS cannot be negative")
+
+        if not 0.0 < self.semantic_cache_threshold <= 1.0:
+            errors.append("SEMANTIC_CACHE_THRESHOLD must be between 0 and 1")
+
+        if self.semantic_cache_size < 0:
+            errors.append("SEMANTIC_CACHE_SIZE cannot be negative")
+
+        if self.semantic_cache_ttl < 0:
+            errors.append("SEMANTIC_CACHE_TTL cannot be negative")
+
         return errors
 
 def get_config() -> Config:
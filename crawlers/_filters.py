@@ -0,0 +1,13 @@
+import re
+from functools import lru_cache
+from urllib.parse import urlparse
+
+# Links to skip: non-HTTP schemes, fragments and downloadable files
+_SKIP_RE = re.compile(r'mailto:|tel:|javascript:|data:|#|\.(?:pdf|jpe?g|png|gif|zip|exe|docx?)$', re.IGNORECASE)
+
+@lru_cache(maxsize=65536)
+def is_crawlable(url: str, base_domain: str) -> bool:
+    """
+    Check if a normalized link is on the crawled domain and points to a page worth fetching
+    """
+    return urlparse(url).netloc == base_domain and not _SKIP_RE.search(url)
@@ -1,12 +1,24 @@
+import math
+import sys
 import time
 import threading
-from typing import Dict, Optional
+from typing import Dict, Optional, Tuple
 from urllib.parse import urlparse
 import logging
-from collections import defaultdict, deque
+from collections import defaultdict
+from functools import lru_cache
 
 logger = logging.getLogger(__name__)
 
+@lru_cache(maxsize=4096)
+def _netloc(url: str) -> str:
+    """
+    Extract the domain of a URL, memoized since crawls hit the same URLs repeatedly
+
+    The result is interned so per-domain lookups hash and compare one shared string.
+    """
+    return sys.intern(urlparse(url).netloc)
+
 class RateLimiter:
     """
     Rate limiter for web crawling to respect server limits
@@ -20,115 +32,115 @@ class RateLimiter:
         """
         self.default_rate = default_rate
         self.default_burst = default_burst
-        self.domains: Dict[str, Dict] = defaultdict(lambda: {
-            'rate': self.default_rate,
-            'burst': self.default_burst,
-            'timestamps': deque(),
+        # Token bucket per domain: up to `burst` tokens, refilled at `rate` tokens per second
+        self.domains: Dict[str, Dict] = {}
+        self._domains_lock = threading.Lock()
+        self.global_bucket = self._new_bucket(default_rate, default_burst)
+
+    @staticmethod
+    def _new_bucket(rate: float, burst: int) -> Dict:
+        """
+        Create a full token bucket
+        """
+        return {
+            'rate': rate,
+            'burst': burst,
+            'tokens': float(burst),
+            'last_refill': time.monotonic(),
             'lock': threading.Lock()
-        })
-        self.global_rate = default_rate
-        self.global_burst = default_burst
-        self.global_timestamps = deque()
-        self.global_lock = threading.Lock()
+        }
+
+    def _get_domain(self, domain: str) -> Dict:
+        """
+        Get the token bucket for a domain, creating it on first use
+        """
+        bucket = self.domains.get(domain)
+        if bucket is not None:
+            return bucket
+
+        with self._domains_lock:
+            bucket = self.domains.get(domain)
+            if bucket is None:
+                bucket = self._new_bucket(self.default_rate, self.default_burst)
+                self.domains[domain] = bucket
+            return bucket
 
     def set_domain_limits(self, domain: str, requests_per_second: float, burst: int = 1):
         """
         Set rate limits for a specific domain
         """
-        with self.domains[domain]['lock']:
-            self.domains[domain]['rate'] = requests_per_second
-            self.domains[domain]['burst'] = burst
+        bucket = self._get_domain(sys.intern(domain))
+        with bucket['lock']:
+            bucket['rate'] = requests_per_second
+            bucket['burst'] = burst
+            bucket['tokens'] = min(bucket['tokens'], float(burst))
 
     def set_global_limits(self, requests_per_second: float, burst: int = 1):
         """
         Set global rate limits
         """
-        self.global_rate = requests_per_second
-        self.global_burst = burst
+        with self.global_bucket['lock']:
+            self.global_bucket['rate'] = requests_per_second
+            self.global_bucket['burst'] = burst
+            self.global_bucket['tokens'] = min(self.global_bucket['tokens'], float(burst))
 
-    def _wait_for_capacity(self, timestamps: deque, rate: float, burst: int):
+    def _reserve(self, bucket: Dict, blocking: bool = True) -> Optional[float]:
         """
-        Wait until there's capacity for a new request
+        Reserve a token from the bucket and return how long to wait before using it
+
+        The bucket may go into debt so that waiting callers queue up behind each
+        other; the lock is only held for the bookkeeping, never while sleeping.
+        Returns None if no token is available and blocking is False.
         """
-        now = time.time()
+        with bucket['lock']:
+            now = time.monotonic()
 
-        # Remove timestamps older than the rate window
-        while timestamps and timestamps[0] <= now - (1.0 / rate):
-            timestamps.popleft()
+            # Refill for the time elapsed since the last request
+            bucket['tokens'] = min(bucket['burst'], bucket['tokens'] + (now - bucket['last_refill']) * bucket['rate'])
+            bucket['last_refill'] = now
 
-        # If we've reached the burst limit, wait
-        if len(timestamps) >= burst:
-            sleep_time = (1.0 / rate) - (now - timestamps[0]) + 0.01  # Small buffer
-            if sleep_time > 0:
-                time.sleep(sleep_time)
-                now = time.time()
+            if bucket['tokens'] >= 1:
+                bucket['tokens'] -= 1
+                return 0.0
 
-        # Add current timestamp
-        timestamps.append(now)
+            if not blocking:
+                return None
+
+            # Wait until the next token is available, then spend it
+            wait_time = (1 - bucket['tokens']) / bucket['rate']
+            bucket['tokens'] -= 1
+            return wait_time
 
     def wait(self, url: str):
         """
         Wait for permission to make a request to the given URL
         """
-        domain = urlparse(url).netloc
-
-        # Apply domain-specific rate limiting
-        domain_config = self.domains[domain]
-        with domain_config['lock']:
-            self._wait_for_capacity(
-                domain_config['timestamps'],
-                domain_config['rate'],
-                domain_config['burst']
-            )
-
-        # Apply global rate limiting
-        with self.global_lock:
-            self._wait_for_capacity(
-                self.global_timestamps,
-                self.global_rate,
-                self.global_burst
-            )
+        self.acquire(url, blocking=True)
 
     def acquire(self, url: str, blocking: bool = True) -> bool:
         """
         Acquire permission to make a request (non-blocking option available)
         """
-        domain = urlparse(url).netloc
-        now = time.time()
-
-        # Check domain-specific limits
-        domain_config = self.domains[domain]
-        with domain_config['lock']:
-            # Remove old timestamps
-            while domain_config['timestamps'] and domain_config['timestamps'][0] <= now - (1.0 / domain_config['rate']):
-                domain_config['timestamps'].popleft()
-
-            if len(domain_config['timestamps']) >= domain_config['burst']:
-                if not blocking:
-                    return False
-                # Wait for capacity
-                sleep_time = (1.0 / domain_config['rate']) - (now - domain_config['timestamps'][0]) + 0.01
-                if sleep_time > 0:
-                    time.sleep(sleep_time)
-                    now = time.time()
-
-        # Check global limits
-        with self.global_lock:
-            while self.global_timestamps and self.global_timestamps[0] <= now - (1.0 / self.global_rate):
-                self.global_timestamps.popleft()
-
-            if len(self.global_timestamps) >= self.global_burst:
-                if not blocking:
-                    return False
-                # Wait for capacity
-                sleep_time = (1.0 / self.global_rate) - (now - self.global_timestamps[0]) + 0.01
-                if sleep_time > 0:
-                    time.sleep(sleep_time)
-                    now = time.time()
-
-        # Add timestamps for the request
-        domain_config['timestamps'].append(now)
-        self.global_timestamps.append(now)
+        domain = _netloc(url)
+
+        # Apply domain-specific rate limiting
+        domain_bucket = self._get_domain(domain)
+        domain_wait = self._reserve(domain_bucket, blocking)
+        if domain_wait is None:
+            return False
+
+        # Apply global rate limiting
+        global_wait = self._reserve(self.global_bucket, blocking)
+        if global_wait is None:
+            # Give the domain token back since the request won't be made
+            with domain_bucket['lock']:
+                domain_bucket['tokens'] = min(domain_bucket['burst'], domain_bucket['tokens'] + 1)
+            return False
+
+        # Both tokens are reserved; sleep outside the locks until they are due
+        sleep_time = max(domain_wait, global_wait)
+        if sleep_time > 0:
+            time.sleep(sleep_time)
 
         return True
 
@@ -160,7 +172,7 @@ class CrawlRateLimiter:
         """
         Determine if a request should be delayed and return the delay amount
         """
-        domain = urlparse(url).netloc
+        domain = _netloc(url)
 
         # Use domain-specific delay if set, otherwise use default
         delay = self.domain_delays.get(domain, self.default_delay)
@@ -178,8 +190,8 @@ class CrawlRateLimiter:
         """
         Record a request attempt
         """
-        domain = urlparse(url).netloc
-        self.last_request_time[domain] = time.time()
+        domain = _netloc(url)
+        self.last_request_time[domain] = time.monotonic()
 
         if not success:
             self.failed_requests[domain] += 1
@@ -191,13 +203,13 @@ class CrawlRateLimiter:
         """
         Wait before making a request to respect rate limits
         """
-        domain = urlparse(url).netloc
+        domain = _netloc(url)
 
         # Check the time since the last request to this domain
-        last_time = self.last_request_time.get(domain, 0)
+        last_time = self.last_request_time.get(domain, float('-inf'))
         delay = self.should_delay_request(url)
 
-        time_since_last = time.time() - last_time
+        time_since_last = time.monotonic() - last_time
         remaining_delay = max(0, delay - time_since_last)
 
         if remaining_delay > 0:
@@ -210,13 +222,13 @@ class CrawlRateLimiter:
         """
         Check if a request can be made without blocking
         """
-        domain = urlparse(url).netloc
+        domain = _netloc(url)
 
         # Check if enough time has passed since the last request
-        last_time = self.last_request_time.get(domain, 0)
+        last_time = self.last_request_time.get(domain, float('-inf'))
         delay = self.should_delay_request(url)
 
-        time_since_last = time.time() - last_time
+        time_since_last = time.monotonic() - last_time
         return time_since_last >= delay
 
 class AdaptiveRateLimiter:
@@ -232,7 +244,8 @@ class AdaptiveRateLimiter:
         self.min_delay = min_delay
         self.max_delay = max_delay
         self.current_delays: Dict[str, float] = {}
-        self.response_times: Dict[str, deque] = defaultdict(lambda: deque(maxlen=10))
+        # Running (count, mean, M2) of response times per domain (Welford's algorithm)
+        self.response_time_stats: Dict[str, Tuple[int, float, float]] = {}
         self.error_counts: Dict[str, int] = defaultdict(int)
         self.success_counts: Dict[str, int] = defaultdict(int)
 
@@ -240,14 +253,26 @@ class AdaptiveRateLimiter:
         """
         Record the response time for a request
         """
-        domain = urlparse(url).netloc
-        self.response_times[domain].append(response_time)
+        domain = _netloc(url)
+        count, mean, m2 = self.response_time_stats.get(domain, (0, 0.0, 0.0))
+        count += 1
+        delta = response_time - mean
+        mean += delta / count
+        m2 += delta * (response_time - mean)
+        self.response_time_stats[domain] = (count, mean, m2)
+
+    def get_response_time_stats(self, url: str) -> Tuple[float, float]:
+        """
+        Get the mean and standard deviation of recorded response times for a URL's domain
+        """
+        count, mean, m2 = self.response_time_stats.get(_netloc(url), (0, 0.0, 0.0))
+        return mean, math.sqrt(m2 / max(count - 1, 1))
 
     def record_result(self, url: str, success: bool):
         """
         Record the result of a request
         """
-        domain = urlparse(url).netloc
+        domain = _netloc(url)
         if success:
             self.success_counts[domain] += 1
             # Reduce delay on success (but not below minimum)
@@ -265,7 +290,7 @@ class AdaptiveRateLimiter:
         """
         Get the appropriate delay for a URL
         """
-        domain = urlparse(url).netloc
+        domain = _netloc(url)
         return self.current_delays.get(domain, self.initial_delay)
 
     def wait_before_request(self, url: str):
@@ -1,27 +1,51 @@
 from urllib.parse import urljoin, urlparse, urlunparse
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
+import asyncio
+import httpx
 import requests
-from typing import List, Set, Dict, Any
+from typing import List, Set, Dict, Deque, Tuple
+from collections import deque
 import logging
 try:
-    from backend.utils import is_valid_url, normalize_url, is_same_domain
+    from backend.utils import is_valid_url, normalize_url, is_same_domain_netloc
 except ImportError:
-    from utils import is_valid_url, normalize_url, is_same_domain
+    from utils import is_valid_url, normalize_url, is_same_domain_netloc
+from crawlers._filters import is_crawlable
+from crawlers.session import create_session
 
 logger = logging.getLogger(__name__)
 
+# Only build anchor tags with an href when a page is parsed just for its links
+_LINK_STRAINER = SoupStrainer('a', href=True)
+
 class URLDiscovery:
     """
     Module for discovering and navigating URLs within a Docusaurus book
     """
 
+    # Docusaurus-specific navigation elements, joined so the tree is walked once per page
+    DOCUSAURUS_LINK_SELECTOR = ", ".join([
+        'nav a[href]',  # Navigation links
+        '.navbar a[href]',  # Navbar links
+        '.sidebar a[href]',  # Sidebar links
+        '.theme-doc-sidebar-menu a[href]',  # Docusaurus sidebar menu
+        '.menu a[href]',  # Menu links
+        'header a[href]',  # Header links
+        'footer a[href]',  # Footer links
+        '.pagination-nav a[href]',  # Pagination links
+        '.theme-edit-this-page a[href]',  # Edit links
+        '.table-of-contents a[href]',  # Table of contents
+        '.sidebar-container a[href]',  # Alternative sidebar
+        '.nav-links a[href]',  # Navigation links
+    ])
+
     def __init__(self, base_url: str, session: requests.Session = None):
         """
         Initialize the URL discovery module
         """
         self.base_url = base_url
         self.base_domain = urlparse(base_url).netloc
-        self.session = session or requests.Session()
+        self.session = session or create_session()
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (compatible; DocusaurusBot/1.0)'
         })
@@ -34,11 +58,11 @@ class URLDiscovery:
             response = self.session.get(url, timeout=10)
             response.raise_for_status()
 
-            soup = BeautifulSoup(response.content, 'html.parser')
-            links = []
+            soup = BeautifulSoup(response.content, 'lxml', parse_only=_LINK_STRAINER)
+            links: Set[str] = set()
 
-            # Find all anchor tags with href attributes
-            for link in soup.find_all('a', href=True):
+            # The strained tree only holds anchor tags with href attributes
+            for link in soup.find_all('a'):
                 href = link['href']
 
                 # Convert relative URLs to absolute URLs
@@ -48,13 +72,10 @@ class URLDiscovery:
                 normalized_url = normalize_url(absolute_url)
 
                 # Only include links from the same domain and with proper extensions
-                if (is_same_domain(self.base_url, absolute_url) and
-                    not normalized_url.endswith(('.pdf', '.jpg', '.jpeg', '.png', '.gif', '.zip', '.exe', '.doc', '.docx')) and
-                    not any(skip in normalized_url.lower() for skip in ['mailto:', 'tel:', '#', 'javascript:', 'data:'])):
-
-                    links.append(normalized_url)
+                if is_crawlable(normalized_url, self.base_domain):
+                    links.add(normalized_url)
 
-            return list(set(links))  # Remove duplicates
+            return list(links)
 
         except Exception as e:
             logger.error(f"Error extracting links from {url}: {str(e)}")
@@ -64,121 +85,106 @@ class URLDiscovery:
         """
         Discover URLs using breadth-first search up to max_depth
         """
-        visited: Set[str] = set()
-        to_visit: List[Dict[str, Any]] = [{'url': normalize_url(start_url), 'depth': 0}]
-        all_urls: Set[str] = {normalize_url(start_url)}
+        start_url = normalize_url(start_url)
+        # Every URL is enqueued at most once, so this set doubles as the visited set
+        enqueued: Set[str] = {start_url}
+        to_visit: Deque[Tuple[str, int]] = deque([(start_url, 0)])
 
         while to_visit:
-            current_item = to_visit.pop(0)
-            current_url = current_item['url']
-            current_depth = current_item['depth']
-
-            if current_url in visited:
-                continue
+            current_url, current_depth = to_visit.popleft()
 
             if current_depth > max_depth:
                 continue
 
-            visited.add(current_url)
-
             logger.info(f"Discovering links from: {current_url} (depth: {current_depth})")
 
             # Extract links from the current page
             links = self.extract_links_from_page(current_url)
 
             for link in links:
-                if link not in visited and link not in all_urls:
-                    all_urls.add(link)
-                    to_visit.append({'url': link, 'depth': current_depth + 1})
+                if link not in enqueued:
+                    enqueued.add(link)
+                    to_visit.append((link, current_depth + 1))
 
-        return list(all_urls)
+        return list(enqueued)
 
     def discover_urls_docusaurus_specific(self, start_url: str, max_depth: int = 5) -> List[str]:
         """
         Discover URLs with Docusaurus-specific logic (navigation, sidebar, etc.)
         """
-        visited: Set[str] = set()
-        to_visit: List[Dict[str, Any]] = [{'url': normalize_url(start_url), 'depth': 0}]
-        all_urls: Set[str] = {normalize_url(start_url)}
+        start_url = normalize_url(start_url)
+        # Every URL is enqueued at most once, so this set doubles as the visited set
+        enqueued: Set[str] = {start_url}
+        to_visit: Deque[Tuple[str, int]] = deque([(start_url, 0)])
 
         while to_visit:
-            current_item = to_visit.pop(0)
-            current_url = current_item['url']
-            current_depth = current_item['depth']
-
-            if current_url in visited:
-                continue
+            current_url, current_depth = to_visit.popleft()
 
             if current_depth > max_depth:
                 continue
 
-            visited.add(current_url)
-
             logger.info(f"Discovering Docusaurus-specific links from: {current_url} (depth: {current_depth})")
 
             try:
                 response = self.session.get(current_url, timeout=10)
                 response.raise_for_status()
 
-                soup = BeautifulSoup(response.content, 'html.parser')
+                soup = BeautifulSoup(response.content, 'lxml')
 
                 # Look for Docusaurus-specific navigation elements
-                docusaurus_selectors = [
-                    'nav a[href]',  # Navigation links
-                    '.navbar a[href]',  # Navbar links
-                    '.sidebar a[href]',  # Sidebar links
-                    '.theme-doc-sidebar-menu a[href]',  # Docusaurus sidebar menu
-                    '.menu a[href]',  # Menu links
-                    'header a[href]',  # Header links
-                    'footer a[href]',  # Footer links
-                    '.pagination-nav a[href]',  # Pagination links
-                    '.theme-edit-this-page a[href]',  # Edit links
-                    '.table-of-contents a[href]',  # Table of contents
-                    '.sidebar-container a[href]',  # Alternative sidebar
-                    '.nav-links a[href]',  # Navigation links
-                ]
-
-                links = []
-                for selector in docusaurus_selectors:
-                    elements = soup.select(selector)
-                    for element in elements:
-                        href = element.get('href')
-                        if href:
-                            absolute_url = urljoin(current_url, href)
-                            normalized_url = normalize_url(absolute_url)
-
-                            # Only include valid, same-domain links
-                            if (is_same_domain(self.base_url, absolute_url) and
-                                not normalized_url.endswith(('.pdf', '.jpg', '.jpeg', '.png', '.gif', '.zip', '.exe', '.doc', '.docx')) and
-                                not any(skip in normalized_url.lower() for skip in ['mailto:', 'tel:', '#', 'javascript:', 'data:'])):
-                                links.append(normalized_url)
-
-                # Remove duplicates
-                links = list(set(links))
-
-                for link in links:
-                    if link not in visited and link not in all_urls:
-                        all_urls.add(link)
-                        to_visit.append({'url': link, 'depth': current_depth + 1})
+                for element in soup.select(self.DOCUSAURUS_LINK_SELECTOR):
+                    href = element.get('href')
+                    if href:
+                        absolute_url = urljoin(current_url, href)
+                        normalized_url = normalize_url(absolute_url)
+
+                        # Only include valid, same-domain links
+                        if normalized_url not in enqueued and is_crawlable(normalized_url, self.base_domain):
+                            enqueued.add(normalized_url)
+                            to_visit.append((normalized_url, current_depth + 1))
 
             except Exception as e:
                 logger.error(f"Error discovering Docusaurus-specific links from {current_url}: {str(e)}")
 
-        return list(all_urls)
+        return list(enqueued)
 
-    def validate_urls(self, urls: List[str]) -> Dict[str, bool]:
+    def validate_urls(self, urls: List[str], max_concurrency: int = 32) -> Dict[str, bool]:
         """
         Validate a list of URLs to check if they are accessible
+
+        Runs validate_urls_async on a new event loop, so it must not be called
+        from a running one; async callers should await validate_urls_async.
         """
-        results = {}
-        for url in urls:
-            try:
-                response = self.session.head(url, timeout=5)
-                results[url] = response.status_code < 400
-            except Exception:
-                results[url] = False
+        if not urls:
+            return {}
+
+        return asyncio.run(self.validate_urls_async(urls, max_concurrency))
+
+    async def validate_urls_async(self, urls: List[str], max_concurrency: int = 32) -> Dict[str, bool]:
+        """
+        Validate URLs with concurrent HEAD requests, at most max_concurrency in flight
+
+        HTTP/2 is negotiated where the server supports it, so requests to the
+        same host are multiplexed over a single connection.
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async with httpx.AsyncClient(
+            http2=True,
+            headers=dict(self.session.headers),
+            timeout=5,
+            limits=httpx.Limits(max_connections=100)
+        ) as client:
+
+            async def check(url: str) -> Tuple[str, bool]:
+                async with semaphore:
+                    try:
+                        response = await client.head(url)
+                        return url, response.status_code < 400
+                    except Exception:
+                        return url, False
 
-        return results
+            return dict(await asyncio.gather(*(check(url) for url in urls)))
 
     def get_sitemap_urls(self) -> List[str]:
         """
@@ -193,7 +199,7 @@ class URLDiscovery:
                 soup = BeautifulSoup(response.content, 'xml')
                 for loc in soup.find_all('loc'):
                     url = loc.text.strip()
-                    if is_same_domain(self.base_url, url):
+                    if is_same_domain_netloc(self.base_domain, url):
                         urls.append(normalize_url(url))
         except Exception as e:
             logger.info(f"No sitemap found or error reading sitemap: {str(e)}")
@@ -220,7 +226,7 @@ class URLDiscovery:
         # Validate the URLs
         valid_urls = []
         for url in all_urls:
-            if is_valid_url(url) and is_same_domain(self.base_url, url):
+            if is_valid_url(url) and is_same_domain_netloc(self.base_domain, url):
                 valid_urls.append(url)
 
         logger.info(f"Discovered {len(valid_urls)} valid URLs")
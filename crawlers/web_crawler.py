@@ -1,30 +1,54 @@
 import requests
 from bs4 import BeautifulSoup
 from urllib.parse import urljoin, urlparse, urlunparse
-from typing import List, Set, Dict, Any
-import time
+from typing import List, Set, Dict, Any, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
 import logging
-from utils import is_valid_url, normalize_url, is_same_domain
+from utils import is_valid_url, normalize_url, is_same_domain_netloc
+from crawlers.rate_limiter import RateLimiter
+from crawlers._filters import is_crawlable
+from crawlers.session import create_session
 
 logger = logging.getLogger(__name__)
 
+# Stop reading a page body after this many bytes
+MAX_PAGE_BYTES = 2_000_000
+HTML_CONTENT_TYPES = ('text/html', 'application/xhtml+xml')
+
+HEADING_TAGS = ['h1', 'h2', 'h3', 'h4', 'h5', 'h6']
+
 class WebCrawler:
     """
     Web crawler for Docusaurus book content
     """
 
-    def __init__(self, base_url: str, delay: float = 1.0, max_depth: int = 5):
+    def __init__(
+        self,
+        base_url: str,
+        delay: float = 1.0,
+        max_depth: int = 5,
+        max_workers: int = 8,
+        session: requests.Session = None
+    ):
         """
         Initialize web crawler
         """
         self.base_url = base_url
+        self.base_domain = urlparse(base_url).netloc
         self.delay = delay
         self.max_depth = max_depth
-        self.session = requests.Session()
+        self.max_workers = max_workers
+        self.session = session or create_session(pool_maxsize=max(64, max_workers))
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (compatible; DocusaurusBot/1.0)'
         })
 
+        # Space out requests to each domain by `delay` seconds, shared across crawl workers
+        self.rate_limiter = None
+        if delay > 0:
+            self.rate_limiter = RateLimiter(default_rate=1.0 / delay, default_burst=1)
+            self.rate_limiter.set_global_limits(max_workers / delay, burst=max_workers)
+
         # Track visited URLs to avoid duplicates
         self.visited_urls: Set[str] = set()
         self.failed_urls: Set[str] = set()
@@ -34,7 +58,7 @@ class WebCrawler:
         Check if page appears to be a valid Docusaurus page
         """
         # Check if page is from same domain as base URL
-        if not is_same_domain(self.base_url, url):
+        if not is_same_domain_netloc(self.base_domain, url):
             return False
 
         # Check for common Docusaurus elements
@@ -73,111 +97,141 @@ class WebCrawler:
         # No recognized content structure found
         return False
 
-    def extract_page_content(self, url: str) -> Dict[str, Any]:
+    def _fetch_page(self, url: str) -> Optional[BeautifulSoup]:
         """
-        Extract content from a single page
+        Fetch and parse a page, respecting the per-domain rate limit
+
+        The body is streamed and cut off at MAX_PAGE_BYTES. Returns None,
+        without reading the body, if the response is not HTML.
         """
-        try:
-            response = self.session.get(url, timeout=10)
+        if self.rate_limiter:
+            self.rate_limiter.wait(url)
+
+        with self.session.get(url, timeout=10, stream=True) as response:
             response.raise_for_status()
 
-            soup = BeautifulSoup(response.content, 'html.parser')
+            content_type = response.headers.get('Content-Type', 'text/html').split(';')[0].strip().lower()
+            if content_type not in HTML_CONTENT_TYPES:
+                logger.warning(f"Skipping non-HTML content ({content_type}): {url}")
+                return None
 
-            # Check if this appears to be a valid Docusaurus page
-            if not self.is_valid_docusaurus_page(url, soup):
-                logger.warning(f"URL does not appear to be a valid Docusaurus page: {url}")
-                return {}
+            body = bytearray()
+            for chunk in response.iter_content(chunk_size=65536):
+                body += chunk
+                if len(body) >= MAX_PAGE_BYTES:
+                    logger.warning(f"Page exceeds {MAX_PAGE_BYTES} bytes, truncating: {url}")
+                    break
 
-            # Extract title
-            title_tag = soup.find('title')
-            title = title_tag.get_text().strip() if title_tag else ""
-
-            # Extract main content - look for Docusaurus-specific content areas
-            # Updated selectors based on actual site structure
-            content_selectors = [
-                'div[class*="docMainContainer"]',
-                'div[class*="markdown"]',
-                'div[class*="theme-layout-main"]',
-                'div[class*="main-wrapper"]',
-                'div[class*="theme-doc-markdown"]',
-                'div[class*="docsWrapper"]',
-                '[class*="main"]',
-                'main',
-                'div[class*="theme-layout-navbar"]',
-                'div[class*="theme-layout-footer-column"]',
-                'body'
-            ]
-
-            content_element = None
-            for selector in content_selectors:
-                try:
-                    content_element = soup.select_one(selector)
-                    if content_element:
-                        break
-                except:
-                    continue
-
-            if not content_element or content_element is None:
-                # If no specific content area found, use body
-                content_element = soup.find('body')
-
-            # If still no element or body is None, just return empty
-            if not content_element or content_element is None:
-                content = ""
-            else:
-                # Remove navigation, headers, footers, and other non-content elements
-                for element in content_element.find_all(['nav', 'header', 'footer', 'script', 'style', 'aside', 'menu', 'div[class*="theme-layout-navbar"]', 'div[class*="theme-layout-footer"]']):
-                    element.decompose()
-
-                # Get text content with proper spacing
-                raw_content = content_element.get_text(separator=' ', strip=True) if content_element else ""
-
-                # Only use content if it has meaningful text (> 50 characters to avoid placeholder divs)
-                if len(raw_content) > 50:
-                    content = raw_content
-                else:
-                    content = ""
-
-                # Remove excessive whitespace
-                content = ' '.join(content.split())
-
-            # Extract headings for hierarchy
-            headings = []
-            for i in range(1, 7):  # h1 to h6
-                for heading in soup.find_all(f'h{i}'):
-                    headings.append({
-                        'level': i,
-                        'text': heading.get_text().strip()
-                    })
-
-            # Extract document hierarchy from URL
-            hierarchy = self._extract_hierarchy_from_url(url)
-
-            return {
-                'url': url,
-                'title': title,
-                'content': content,
-                'headings': headings,
-                'hierarchy': hierarchy,
-                'status': 'success'
-            }
+        return BeautifulSoup(bytes(body[:MAX_PAGE_BYTES]), 'lxml')
 
+    def _failed_page(self, url: str, error: Exception, message: str) -> Dict[str, Any]:
+        """
+        Record a failed URL and build its result entry
+        """
+        logger.error(f"{message} {url}: {str(error)}")
+        self.failed_urls.add(url)
+        return {
+            'url': url,
+            'status': 'failed',
+            'error': str(error)
+        }
+
+    def extract_page_content(self, url: str) -> Dict[str, Any]:
+        """
+        Extract content from a single page
+        """
+        try:
+            soup = self._fetch_page(url)
+            if soup is None:
+                return {}
+            return self._parse_page(url, soup)
         except requests.RequestException as e:
-            logger.error(f"Failed to fetch {url}: {str(e)}")
-            self.failed_urls.add(url)
-            return {
-                'url': url,
-                'status': 'failed',
-                'error': str(e)
-            }
+            return self._failed_page(url, e, "Failed to fetch")
         except Exception as e:
-            logger.error(f"Error processing {url}: {str(e)}")
-            self.failed_urls.add(url)
-            return {
-                'url': url,
-                'status': 'failed',
-                'error': str(e)
+            return self._failed_page(url, e, "Error processing")
+
+    def _parse_page(self, url: str, soup: BeautifulSoup) -> Dict[str, Any]:
+        """
+        Extract content from an already fetched page
+        """
+        # Check if this appears to be a valid Docusaurus page
+        if not self.is_valid_docusaurus_page(url, soup):
+            logger.warning(f"URL does not appear to be a valid Docusaurus page: {url}")
+            return {}
+
+        # Extract title
+        title_tag = soup.find('title')
+        title = title_tag.get_text().strip() if title_tag else ""
+
+        # Extract main content - look for Docusaurus-specific content areas
+        # Updated selectors based on actual site structure
+        content_selectors = [
+            'div[class*="docMainContainer"]',
+            'div[class*="markdown"]',
+            'div[class*="theme-layout-main"]',
+            'div[class*="main-wrapper"]',
+            'div[class*="theme-doc-markdown"]',
+            'div[class*="docsWrapper"]',
+            '[class*="main"]',
+            'main',
+            'div[class*="theme-layout-navbar"]',
+            'div[class*="theme-layout-footer-column"]',
+            'body'
+        ]
+
+        content_element = None
+        for selector in content_selectors:
+            try:
+                content_element = soup.select_one(selector)
+                if content_element:
+                    break
+            except:
+                continue
+
+        if not content_element or content_element is None:
+            # If no specific content area found, use body
+            content_element = soup.find('body')
+
+        # If still no element or body is None, just return empty
+        if not content_element or content_element is None:
+            content = ""
+        else:
+            # Remove navigation, headers, footers, and other non-content elements
+            for element in content_element.find_all(['nav', 'header', 'footer', 'script', 'style', 'aside', 'menu', 'div[class*="theme-layout-navbar"]', 'div[class*="theme-layout-footer"]']):
+                element.decompose()
+
+            # Get text content with proper spacing
+            raw_content = content_element.get_text(separator=' ', strip=True) if content_element else ""
+
+            # Only use content if it has meaningful text (> 50 characters to avoid placeholder divs)
+            if len(raw_content) > 50:
+                content = raw_content
+            else:
+                content = ""
+
+            # Remove excessive whitespace
+            content = ' '.join(content.split())
+
+        # Extract headings for hierarchy
+        headings = [
+            {
+                'level': int(heading.name[1]),
+                'text': heading.get_text().strip()
             }
+            for heading in soup.find_all(HEADING_TAGS)
+        ]
+
+        # Extract document hierarchy from URL
+        hierarchy = self._extract_hierarchy_from_url(url)
+
+        return {
+            'url': url,
+            'title': title,
+            'content': content,
+            'headings': headings,
+            'hierarchy': hierarchy,
+            'status': 'success'
+        }
 
     def _extract_hierarchy_from_url(self, url: str) -> str:
         """
@@ -192,72 +246,86 @@ class WebCrawler:
         # Join path parts with ' > ' to create hierarchy
         return " > ".join(path_parts)
 
-    def crawl_from_url(self, start_url: str, current_depth: int = 0) -> List[Dict[str, Any]]:
+    def _extract_links(self, url: str, soup: BeautifulSoup) -> List[str]:
         """
-        Crawl starting from a specific URL up to max depth
+        Find same-domain links on a page that are worth crawling
         """
-        if current_depth > self.max_depth:
-            logger.info(f"Max depth {self.max_depth} reached, stopping crawl from {start_url}")
-            return []
+        links = []
+        for link in soup.find_all('a', href=True):
+            href = link['href']
 
-        if normalize_url(start_url) in self.visited_urls:
-            logger.debug(f"Already visited: {start_url}")
-            return []
+            # Convert relative URLs to absolute URLs
+            absolute_url = urljoin(url, href)
 
-        # Validate URL
-        if not is_valid_url(start_url):
-            logger.warning(f"Invalid URL: {start_url}")
-            return []
+            # Normalize URL
+            normalized_url = normalize_url(absolute_url)
 
-        # Add to visited URLs
-        normalized_start_url = normalize_url(start_url)
-        self.visited_urls.add(normalized_start_url)
+            # Only follow links from same domain and with proper extensions
+            if is_crawlable(normalized_url, self.base_domain):
+                links.append(absolute_url)
 
-        # Extract content from current page
-        logger.info(f"Crawling: {start_url}")
-        page_data = self.extract_page_content(start_url)
+        return links
 
-        if page_data.get('status') == 'failed':
-            logger.error(f"Failed to crawl {start_url}: {page_data.get('error')}")
-            return [page_data]
+    def _crawl_page(self, url: str, depth: int) -> Tuple[Dict[str, Any], List[str]]:
+        """
+        Fetch a page once and return its extracted content along with the links to follow
+        """
+        logger.info(f"Crawling: {url}")
+        try:
+            soup = self._fetch_page(url)
+            if soup is None:
+                return {}, []
 
-        results = [page_data]
+            # Collect links before content extraction strips navigation from the tree
+            links = self._extract_links(url, soup) if depth < self.max_depth else []
 
-        # Add delay to be respectful to server
-        time.sleep(self.delay)
+            return self._parse_page(url, soup), links
+        except requests.RequestException as e:
+            return self._failed_page(url, e, "Failed to fetch"), []
+        except Exception as e:
+            return self._failed_page(url, e, "Error processing"), []
 
-        # Find links on page and crawl them recursively
-        if current_depth < self.max_depth:
-            try:
-                response = self.session.get(start_url, timeout=10)
-                response.raise_for_status()
-                soup = BeautifulSoup(response.content, 'html.parser')
+    def crawl_from_url(self, start_url: str, current_depth: int = 0) -> List[Dict[str, Any]]:
+        """
+        Crawl starting from a specific URL up to max depth
+
+        Pages are fetched breadth-first by a pool of worker threads. Only this
+        thread schedules URLs, so the visited set needs no locking.
+        """
+        results = []
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            pending = {}
 
-                # Find all links on page
-                links = soup.find_all('a', href=True)
-                for link in links:
-                    href = link['href']
+            def schedule(url: str, depth: int):
+                if depth > self.max_depth:
+                    logger.debug(f"Max depth {self.max_depth} reached, not crawling {url}")
+                    return
 
-                    # Convert relative URLs to absolute URLs
-                    absolute_url = urljoin(start_url, href)
+                normalized_url = normalize_url(url)
+                if normalized_url in self.visited_urls:
+                    logger.debug(f"Already visited: {url}")
+                    return
 
-                    # Normalize URL
-                    normalized_url = normalize_url(absolute_url)
+                # Validate URL
+                if not is_valid_url(url):
+                    logger.warning(f"Invalid URL: {url}")
+                    return
 
-                    # Only follow links from same domain and with proper extensions
-                    if (is_same_domain(self.base_url, absolute_url) and
-                        normalized_url not in self.visited_urls and
-                        not normalized_url.endswith(('.pdf', '.jpg', '.jpeg', '.png', '.gif', '.zip', '.exe'))):
+                self.visited_urls.add(normalized_url)
+                pending[executor.submit(self._crawl_page, url, depth)] = depth
 
-                        # Recursively crawl link
-                        child_results = self.crawl_from_url(absolute_url, current_depth + 1)
-                        results.extend(child_results)
+            schedule(start_url, current_depth)
 
-                        # Add delay between requests to be respectful
-                        time.sleep(self.delay)
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    depth = pending.pop(future)
+                    page_data, links = future.result()
+                    results.append(page_data)
 
-            except Exception as e:
-                logger.error(f"Error finding links on {start_url}: {str(e)}")
+                    for link in links:
+                        schedule(link, depth + 1)
 
         return results
 
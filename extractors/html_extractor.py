@@ -1,20 +1,135 @@
-from bs4 import BeautifulSoup
-from typing import Dict, List, Any, Optional
+from bs4 import BeautifulSoup, CData, FeatureNotFound, NavigableString, SoupStrainer, Tag
+import soupsieve as sv
+from typing import Dict, List, Any, Optional, Tuple
+from collections import OrderedDict
+import hashlib
 import re
 import logging
+import threading
+
+try:
+    from selectolax.lexbor import LexborHTMLParser as HTMLParser
+except ImportError:  # selectolax is optional, BeautifulSoup handles everything without it
+    HTMLParser = None
 
 logger = logging.getLogger(__name__)
 
+def _collapse_ws(text: str) -> str:
+    """
+    Collapse whitespace runs to single spaces and trim the ends
+
+    Matches a whitespace regex substitution followed by strip(), since str.split
+    splits on the same Unicode whitespace characters, but runs entirely in C.
+    """
+    return ' '.join(text.split())
+
+_NAV_CLASS_RE = re.compile(r'nav|menu|sidebar|toc|footer|header')
+
+HEADING_TAGS = ['h1', 'h2', 'h3', 'h4', 'h5', 'h6']
+
+# Everything extract_content reads outside the main content area, collected in one walk
+_OUTLINE_TAGS = ['title', *HEADING_TAGS, 'a']
+_OUTLINE_SELECTOR = ", ".join(['title', *HEADING_TAGS, 'a[href]'])
+
+# Chunk break points, in order of preference
+SENTENCE_SEPARATORS = ('.', '!', '?', '\n', ';', ',')
+
+# Only build the tags a lookup needs when the rest of the page is irrelevant
+_METADATA_STRAINER = SoupStrainer(['title', 'meta'])
+_HEADINGS_STRAINER = SoupStrainer(HEADING_TAGS)
+
+def _make_soup(html_content: str, parse_only: Optional[SoupStrainer] = None) -> BeautifulSoup:
+    """
+    Parse HTML with lxml, falling back to the pure-Python parser if lxml is not installed
+    """
+    try:
+        return BeautifulSoup(html_content, 'lxml', parse_only=parse_only)
+    except FeatureNotFound:
+        return BeautifulSoup(html_content, 'html.parser', parse_only=parse_only)
+
+# Main content areas in order of preference
+CONTENT_SELECTORS = (
+    'main',
+    'article',
+    '[role="main"]',
+    '.main-content',
+    '.content',
+    '.doc-content',
+    '.container',
+    'body'
+)
+
+# Compiled once so each page skips soupsieve's parse and cache lookup per selector
+_COMPILED_CONTENT_SELECTORS = tuple(sv.compile(selector) for selector in CONTENT_SELECTORS)
+
+# Tags whose subtrees are left out of the main content text
+NON_CONTENT_TAGS = frozenset(['nav', 'header', 'footer', 'aside', 'menu'])
+_TEXT_TYPES = (NavigableString, CData)
+
+def _content_strings(element: Tag):
+    """
+    Yield the stripped, non-empty text of element, skipping navigation and UI subtrees
+
+    Walks the tree once without modifying it, instead of decomposing the
+    skipped elements and then collecting text with get_text.
+    """
+    stack = [iter(element.contents)]
+    while stack:
+        for child in stack[-1]:
+            if isinstance(child, Tag):
+                if child.name in NON_CONTENT_TAGS or _NAV_CLASS_RE.search(' '.join(child.get('class') or ())):
+                    continue
+                stack.append(iter(child.contents))
+                break
+            if type(child) in _TEXT_TYPES:
+                text = child.strip()
+                if text:
+                    yield text
+        else:
+            stack.pop()
+
+def _in_non_content(tag: Tag, root: Optional[Tag]) -> bool:
+    """
+    Check whether tag lies in a navigation or UI subtree inside root, which the main content leaves out
+    """
+    if root is None:
+        return False
+
+    skipped = False
+    node = tag
+    while node is not None:
+        if node is root:
+            return skipped
+        if not skipped and (node.name in NON_CONTENT_TAGS or _NAV_CLASS_RE.search(' '.join(node.get('class') or ()))):
+            skipped = True
+        node = node.parent
+
+    return False
+
+# Non-content elements stripped from the main content area; the class
+# substring matches mirror the nav/menu/sidebar/toc/footer/header class regex
+_NON_CONTENT_SELECTOR = ", ".join([
+    'nav', 'header', 'footer', 'aside', 'menu',
+    '[class*="nav"]', '[class*="menu"]', '[class*="sidebar"]',
+    '[class*="toc"]', '[class*="footer"]', '[class*="header"]'
+])
+
 class HTMLExtractor:
     """
     Extract clean text content from HTML, preserving document structure and hierarchy
     """
 
-    def __init__(self):
+    def __init__(self, cache_size: int = 128):
         """
         Initialize the HTML extractor
+
+        Args:
+            cache_size: Number of parsed documents to keep, keyed by a hash of
+                their HTML, so re-extracting the same page skips the parse (0 disables)
         """
-        pass
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[bytes, Dict[str, Any]]" = OrderedDict()
+        self._cache_lock = threading.Lock()
 
     def extract_content(self, html_content: str, url: str = "") -> Dict[str, Any]:
         """
@@ -31,22 +146,45 @@ class HTMLExtractor:
                 'url': url
             }
 
-        soup = BeautifulSoup(html_content, 'html.parser')
+        if self.cache_size <= 0:
+            return self._extract_content_uncached(html_content, url)
+
+        key = hashlib.blake2b(html_content.encode('utf-8', 'surrogatepass'), digest_size=16).digest()
+        with self._cache_lock:
+            extracted = self._cache.get(key)
+            if extracted is not None:
+                self._cache.move_to_end(key)
+
+        if extracted is None:
+            extracted = self._extract_content_uncached(html_content, url)
+            with self._cache_lock:
+                self._cache[key] = extracted
+                if len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+
+        # Callers update the result in place, so hand out a copy of the cached entry
+        return {**extracted, 'url': url}
+
+    def _extract_content_uncached(self, html_content: str, url: str) -> Dict[str, Any]:
+        """
+        Parse HTML and extract its content, trying selectolax before BeautifulSoup
+        """
+        if HTMLParser is not None:
+            try:
+                return self._extract_content_fast(html_content, url)
+            except Exception as e:
+                logger.debug(f"selectolax extraction failed for {url}, falling back to BeautifulSoup: {str(e)}")
+
+        soup = _make_soup(html_content)
 
         # Remove script and style elements
         for script in soup(["script", "style"]):
             script.decompose()
 
-        # Extract document title
-        title = ""
-        title_tag = soup.find('title')
-        if title_tag:
-            title = title_tag.get_text().strip()
-
-        # Extract headings and content
-        headings = self._extract_headings(soup)
-        content = self._extract_main_content(soup)
-        links = self._extract_links(soup)
+        # Find the main content area, then extract title, headings and links in a single walk
+        content_element = self._find_content_element(soup)
+        title, headings, links = self._extract_outline(soup, content_element)
+        content = self._extract_main_content(content_element)
 
         # Extract document hierarchy from headings
         hierarchy = self._build_hierarchy(headings)
@@ -60,79 +198,157 @@ class HTMLExtractor:
             'url': url
         }
 
-    def _extract_headings(self, soup: BeautifulSoup) -> List[Dict[str, Any]]:
+    def _extract_content_fast(self, html_content: str, url: str) -> Dict[str, Any]:
         """
-        Extract all headings from the HTML
+        Same extraction as extract_content, with the tree walks done by selectolax in C
         """
+        tree = HTMLParser(html_content)
+        tree.strip_tags(['script', 'style'])
+
+        # Title, headings and links come from a single selector match
+        title = None
         headings = []
-        for i in range(1, 7):  # h1 to h6
-            for heading in soup.find_all(f'h{i}'):
-                heading_text = heading.get_text().strip()
+        links = []
+        for node in tree.css(_OUTLINE_SELECTOR):
+            tag = node.tag
+            if tag == 'a':
+                links.append((node.mem_id, {
+                    'text': node.text().strip(),
+                    'url': node.attributes.get('href') or ''
+                }))
+            elif tag == 'title':
+                if title is None:
+                    title = node.text().strip()
+            else:
+                heading_text = node.text().strip()
                 if heading_text:
+                    attrs = node.attributes
                     headings.append({
-                        'level': i,
+                        'level': int(tag[1]),
                         'text': heading_text,
-                        'id': heading.get('id', ''),
-                        'class': heading.get('class', [])
+                        'id': attrs.get('id') or '',
+                        'class': (attrs.get('class') or '').split()
                     })
 
+        content = ""
+        for selector in CONTENT_SELECTORS:
+            content_element = tree.css_first(selector)
+            if content_element:
+                non_content = content_element.css(_NON_CONTENT_SELECTOR)
+
+                # Links inside the stripped elements are left out, as they are from the content
+                skipped_links = {link.mem_id for element in non_content for link in element.css('a[href]')}
+                links = [link for mem_id, link in links if mem_id not in skipped_links]
+
+                # Matches come in document order, so removing them in reverse
+                # drops nested matches before the ancestors that contain them
+                for element in reversed(non_content):
+                    element.decompose()
+                content = _collapse_ws(content_element.text(separator=' ', strip=True))
+                break
+        else:
+            links = [link for _, link in links]
+
+        return {
+            'title': title or "",
+            'content': content,
+            'headings': headings,
+            'hierarchy': self._build_hierarchy(headings),
+            'links': links,
+            'url': url
+        }
+
+    def _extract_headings(self, soup: BeautifulSoup) -> List[Dict[str, Any]]:
+        """
+        Extract all headings from the HTML
+        """
+        headings = []
+        # One walk over the tree, yielding headings in document order
+        for heading in soup.find_all(HEADING_TAGS):
+            self._add_heading(headings, heading)
+
         return headings
 
-    def _extract_main_content(self, soup: BeautifulSoup) -> str:
+    def _extract_outline(
+        self,
+        soup: BeautifulSoup,
+        content_element: Optional[Tag] = None
+    ) -> Tuple[str, List[Dict[str, Any]], List[Dict[str, str]]]:
         """
-        Extract the main content from HTML, focusing on article or main content areas
+        Extract the title, headings and links from the HTML in a single walk
+
+        Links in the navigation and UI subtrees that the main content leaves
+        out of content_element are skipped.
         """
-        # Look for main content areas in order of preference
-        content_selectors = [
-            'main',
-            'article',
-            '[role="main"]',
-            '.main-content',
-            '.content',
-            '.doc-content',
-            '.container',
-            'body'
-        ]
+        title_tag = None
+        headings = []
+        links = []
+        for tag in soup.find_all(_OUTLINE_TAGS):
+            name = tag.name
+            if name == 'a':
+                if tag.has_attr('href') and not _in_non_content(tag, content_element):
+                    links.append({
+                        'text': tag.get_text().strip(),
+                        'url': tag['href']
+                    })
+            elif name == 'title':
+                if title_tag is None:
+                    title_tag = tag
+            else:
+                self._add_heading(headings, tag)
 
-        content_element = None
-        for selector in content_selectors:
-            content_element = soup.select_one(selector)
-            if content_element:
-                break
+        title = title_tag.get_text().strip() if title_tag else ""
+        return title, headings, links
 
-        if not content_element or content_element is None:
-            content = ""
-        else:
-            # Remove navigation, headers, footers, and other non-content elements
-            for element in content_element.find_all(['nav', 'header', 'footer', 'aside', 'menu']):
-                element.decompose()
+    @staticmethod
+    def _add_heading(headings: List[Dict[str, Any]], heading) -> None:
+        """
+        Append a heading tag to headings, skipping headings without text
+        """
+        heading_text = heading.get_text().strip()
+        if heading_text:
+            headings.append({
+                'level': int(heading.name[1]),
+                'text': heading_text,
+                'id': heading.get('id') or '',
+                'class': heading.get('class') or []
+            })
 
-            # Remove elements that are likely navigation or UI elements
-            for element in content_element.find_all(class_=re.compile(r'nav|menu|sidebar|toc|footer|header')):
-                element.decompose()
+    def extract_headings(self, html_content: str) -> List[Dict[str, Any]]:
+        """
+        Extract only the headings from HTML, without building the rest of the tree
+        """
+        if not html_content or not html_content.strip():
+            return []
 
-            # Get text content with proper spacing
-            content = content_element.get_text(separator=' ', strip=True)
+        return self._extract_headings(_make_soup(html_content, parse_only=_HEADINGS_STRAINER))
 
-        # Clean up excessive whitespace
-        content = re.sub(r'\s+', ' ', content)
+    def _find_content_element(self, soup: BeautifulSoup) -> Optional[Tag]:
+        """
+        Find the main content area, preferring article or main content elements
+        """
+        for selector in _COMPILED_CONTENT_SELECTORS:
+            content_element = selector.select_one(soup)
+            if content_element:
+                return content_element
 
-        return content
+        return None
 
-    def _extract_links(self, soup: BeautifulSoup) -> List[Dict[str, str]]:
+    def _extract_main_content(self, content_element: Optional[Tag]) -> str:
         """
-        Extract all links from the HTML
+        Extract the text of the main content area
         """
-        links = []
-        for link in soup.find_all('a', href=True):
-            link_text = link.get_text().strip()
-            link_url = link['href']
-            links.append({
-                'text': link_text,
-                'url': link_url
-            })
+        if not content_element or content_element is None:
+            content = ""
+        else:
+            # Get text content with proper spacing, leaving out navigation,
+            # headers, footers and elements whose class marks them as UI
+            content = ' '.join(_content_strings(content_element))
+
+        # Clean up excessive whitespace
+        content = _collapse_ws(content)
 
-        return links
+        return content
 
     def _build_hierarchy(self, headings: List[Dict[str, Any]]) -> str:
         """
@@ -142,7 +358,7 @@ class HTMLExtractor:
             return "Unknown"
 
         # Find the most prominent heading (lowest level number)
-        top_level = min([h['level'] for h in headings]) if headings else 1
+        top_level = min(h['level'] for h in headings)
 
         # Get headings at the top level or one level below
         hierarchy_parts = []
@@ -168,8 +384,33 @@ class HTMLExtractor:
         if not content:
             return []
 
-        # Split content into chunks
-        chunks = []
+        title = extracted['title']
+        hierarchy = extracted['hierarchy']
+        headings = extracted['headings']
+
+        # Slice every chunk in one pass over the precomputed offsets
+        pieces = ((content[start:end].strip(), start, end) for start, end in self._chunk_bounds(content, chunk_size, overlap))
+
+        return [
+            {
+                'content': chunk_text,
+                'source_url': url,
+                'title': title,
+                'hierarchy': hierarchy,
+                'headings': headings,
+                'start_pos': start,
+                'end_pos': end
+            }
+            for chunk_text, start, end in pieces
+            if chunk_text  # Only add non-empty chunks
+        ]
+
+    @staticmethod
+    def _chunk_bounds(content: str, chunk_size: int, overlap: int) -> List[Tuple[int, int]]:
+        """
+        Compute the (start, end) offsets of each chunk of content
+        """
+        bounds = []
         start = 0
         content_length = len(content)
 
@@ -181,25 +422,14 @@ class HTMLExtractor:
                 # Look for sentence boundary near the end
                 search_start = end - 50  # Look back up to 50 chars
                 if search_start < content_length:
-                    for sep in ['.', '!', '?', '\n', ';', ',']:
+                    # Each rfind only scans the 50-char window, so this stays linear in the content
+                    for sep in SENTENCE_SEPARATORS:
                         pos = content.rfind(sep, search_start, end)
                         if pos != -1:
                             end = pos + 1
                             break
 
-            chunk_text = content[start:end].strip()
-
-            if chunk_text:  # Only add non-empty chunks
-                chunk_data = {
-                    'content': chunk_text,
-                    'source_url': url,
-                    'title': extracted['title'],
-                    'hierarchy': extracted['hierarchy'],
-                    'headings': extracted['headings'],
-                    'start_pos': start,
-                    'end_pos': end
-                }
-                chunks.append(chunk_data)
+            bounds.append((start, end))
 
             # Move to next chunk position with overlap
             start = end - overlap if end < content_length else end
@@ -208,7 +438,7 @@ class HTMLExtractor:
             if start < content_length and content_length - start < overlap:
                 break
 
-        return chunks
+        return bounds
 
     def clean_content(self, content: str) -> str:
         """
@@ -217,17 +447,15 @@ class HTMLExtractor:
         if not content:
             return ""
 
-        # Replace multiple whitespace with single space
-        content = re.sub(r'\s+', ' ', content)
-        # Remove leading/trailing whitespace
-        content = content.strip()
-        return content
+        # Replace multiple whitespace with single space and trim the ends
+        return _collapse_ws(content)
 
     def extract_metadata(self, html_content: str, url: str = "") -> Dict[str, Any]:
         """
         Extract metadata from HTML content
         """
-        soup = BeautifulSoup(html_content, 'html.parser')
+        # Metadata only lives in <title> and <meta>, so skip building the rest of the page
+        soup = _make_soup(html_content, parse_only=_METADATA_STRAINER)
 
         metadata = {
             'url': url,
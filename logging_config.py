@@ -9,7 +9,8 @@ def setup_logging(level: str = "INFO", log_file: Optional[str] = None) -> loggin
     """
     # Create logger
     logger = logging.getLogger('rag_chatbot')
-    logger.setLevel(getattr(logging, level.upper()))
+    num_level = getattr(logging, level.upper())
+    logger.setLevel(num_level)
 
     # Prevent adding multiple handlers if logger already has handlers
     if logger.handlers:
@@ -17,7 +18,7 @@ def setup_logging(level: str = "INFO", log_file: Optional[str] = None) -> loggin
 
     # Create console handler
     console_handler = logging.StreamHandler(sys.stdout)
-    console_handler.setLevel(getattr(logging, level.upper()))
+    console_handler.setLevel(num_level)
 
     # Create formatter
     formatter = logging.Formatter(
@@ -32,7 +33,7 @@ def setup_logging(level: str = "INFO", log_file: Optional[str] = None) -> loggin
     # Add file handler if log_file is specified
     if log_file:
         file_handler = logging.FileHandler(log_file)
-        file_handler.setLevel(getattr(logging, level.upper()))
+        file_handler.setLevel(num_level)
         file_handler.setFormatter(formatter)
         logger.addHandler(file_handler)
 
@@ -45,8 +46,12 @@ def log_progress(current: int, total: int, message: str = "", logger: logging.Lo
     if logger is None:
         logger = logging.getLogger('rag_chatbot')
 
+    # Skip the formatting entirely when INFO records would be discarded
+    if not logger.isEnabledFor(logging.INFO):
+        return
+
     percentage = (current / total) * 100 if total > 0 else 0
-    logger.info(f"Progress: {current}/{total} ({percentage:.1f}%) - {message}")
+    logger.info("Progress: %d/%d (%.1f%%) - %s", current, total, percentage, message)
 
 def create_progress_callback(logger: logging.Logger = None) -> Callable[[int, int, str], None]:
     """
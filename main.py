@@ -12,7 +12,7 @@ This script implements the complete pipeline for:
 import argparse
 import sys
 import os
-from typing import List, Dict, Any
+from typing import List, Dict, Any, TYPE_CHECKING
 import logging
 import time
 
@@ -21,36 +21,47 @@ sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from config import get_config, Config
 from logging_config import setup_logging, log_progress, create_progress_callback
-from crawlers.web_crawler import WebCrawler
-from extractors.html_extractor import HTMLExtractor
-from processors.text_chunker import TextChunker
-from crawlers.url_discovery import URLDiscovery
-from services.crawl_service import CrawlService
-from services.metadata_service import MetadataService
-from clients.cohere_client import CohereService
-from clients.qdrant_client import QdrantService
-from services.embedding_service import EmbeddingService
-from services.vector_storage_service import VectorStorageService
-from services.vector_service import VectorService
-from services.duplicate_service import DuplicateService
-from validators.embedding_validator import EmbeddingValidator
-from services.state_service import StateService, PipelineState
-from services.resume_service import ResumeService
-from models.crawl_session import CrawlSession
-from services.error_service import ErrorService, retry_on_failure
-from services.checkpoint_service import CheckpointService
-from services.metrics_service import MetricsService
+from services.error_service import retry_on_failure
 from validators.input_validator import InputValidator
-from crawlers.rate_limiter import CrawlRateLimiter
+
+if TYPE_CHECKING:
+    from clients.qdrant_client import QdrantService
 
 
 def create_services(config: Config) -> Dict[str, Any]:
     """
     Create and configure all services needed for the pipeline
+
+    The client and service modules pull in cohere, qdrant_client, numpy and the
+    HTML parsers, so they are imported here rather than at module level to keep
+    startup fast for runs that exit early, such as --validate-only.
     """
+    from clients.cohere_client import CohereService
+    from clients.qdrant_client import QdrantService
+    from crawlers.rate_limiter import CrawlRateLimiter
+    from services.checkpoint_service import CheckpointService
+    from services.crawl_service import CrawlService
+    from services.duplicate_service import DuplicateService
+    from services.embedding_service import EmbeddingService
+    from services.error_service import ErrorService
+    from services.metadata_service import MetadataService
+    from services.metrics_service import MetricsService
+    from services.resume_service import ResumeService
+    from services.state_service import StateService
+    from services.vector_service import VectorService
+    from services.vector_storage_service import VectorStorageService
+    from validators.embedding_validator import EmbeddingValidator
+
     # Initialize clients
-    cohere_service = CohereService(config.cohere_api_key)
-    qdrant_service = QdrantService(config.qdrant_url, config.qdrant_api_key, config.qdrant_collection_name)
+    cohere_service = CohereService(config.cohere_api_key, config.cohere_embedding_type)
+    qdrant_service = QdrantService(
+        config.qdrant_url,
+        config.qdrant_api_key,
+        config.qdrant_collection_name,
+        config.qdrant_quantization,
+        config.qdrant_prefer_grpc,
+        config.qdrant_grpc_port
+    )
 
     # Initialize services
     metadata_service = MetadataService()
@@ -128,7 +139,7 @@ def validate_configuration(config: Config) -> bool:
     return True
 
 
-def create_collection_if_needed(qdrant_service: QdrantService, vector_size: int = 1024) -> bool:
+def create_collection_if_needed(qdrant_service: 'QdrantService', vector_size: int = 1024) -> bool:
     """
     Create the Qdrant collection if it doesn't exist
     """
@@ -196,19 +207,18 @@ def run_ingestion_pipeline(services: Dict[str, Any], resume: bool = False) -> bo
     start_time = time.time()
 
     try:
-        # Use the crawl service with progress tracking
+        # Stream chunks from the crawl straight into embedding and storage, a batch at a time
         progress_callback = create_progress_callback(logger)
-        chunks = crawl_service.crawl_with_progress_callback(progress_callback)
+        chunks = crawl_service.crawl_extract_and_chunk(progress_callback)
 
-        if not chunks:
+        logger.info("Processing chunks through embedding and storage...")
+        result = vector_service.process_chunks_in_batches(chunks)
+
+        if not result['total_chunks']:
             logger.warning("No chunks were created from crawling. Pipeline completed with no data.")
             return True
 
-        logger.info(f"Created {len(chunks)} chunks from crawling")
-
-        # Process chunks through the vector service
-        logger.info("Processing chunks through embedding and storage...")
-        result = vector_service.process_and_store_chunks(chunks)
+        logger.info(f"Processed {result['total_chunks']} chunks from crawling")
 
         if not result['success']:
             logger.error("Vector processing failed")
@@ -1,8 +1,8 @@
-from dataclasses import dataclass
-from typing import List, Optional, Dict, Any
+from dataclasses import dataclass, field
+from typing import List, Optional, Dict, Any, Set
 from datetime import datetime
 
-@dataclass
+@dataclass(slots=True)
 class CrawlSession:
     """
     An execution instance of the ingestion pipeline that processes a set of URLs and generates embeddings
@@ -15,6 +15,9 @@ class CrawlSession:
     failed_urls: List[str] = None
     total_chunks: int = 0
     metadata: Dict[str, Any] = None
+    # Membership indexes for the URL lists, kept in sync by add_processed_url/add_failed_url
+    _processed_set: Set[str] = field(init=False, repr=False, compare=False, default_factory=set)
+    _failed_set: Set[str] = field(init=False, repr=False, compare=False, default_factory=set)
 
     def __post_init__(self):
         """Initialize default values for mutable fields"""
@@ -24,6 +27,8 @@ class CrawlSession:
             self.failed_urls = []
         if self.metadata is None:
             self.metadata = {}
+        self._processed_set = set(self.processed_urls)
+        self._failed_set = set(self.failed_urls)
 
     def to_dict(self) -> Dict[str, Any]:
         """
@@ -104,14 +109,16 @@ class CrawlSession:
         """
         Add a URL to the list of processed URLs
         """
-        if url not in self.processed_urls:
+        if url not in self._processed_set:
+            self._processed_set.add(url)
             self.processed_urls.append(url)
 
     def add_failed_url(self, url: str, error: str = None):
         """
         Add a URL to the list of failed URLs
         """
-        if url not in self.failed_urls:
+        if url not in self._failed_set:
+            self._failed_set.add(url)
             self.failed_urls.append(url)
 
     def mark_completed(self):
@@ -1,8 +1,9 @@
 from dataclasses import dataclass
 from typing import Dict, Any, Optional
 from datetime import datetime
+import numpy as np
 
-@dataclass
+@dataclass(slots=True)
 class DocumentChunk:
     """
     A segment of text extracted from a Docusaurus page with associated metadata
@@ -12,7 +13,12 @@ class DocumentChunk:
     source_url: str
     document_hierarchy: str
     metadata: Dict[str, Any]
-    embedding: Optional[list] = None
+    embedding: Optional[np.ndarray] = None
+
+    def __post_init__(self):
+        """Store the embedding as a contiguous float32 array"""
+        if self.embedding is not None:
+            self.embedding = np.asarray(self.embedding, dtype=np.float32)
 
     def to_dict(self) -> Dict[str, Any]:
         """
@@ -24,7 +30,7 @@ class DocumentChunk:
             "source_url": self.source_url,
             "document_hierarchy": self.document_hierarchy,
             "metadata": self.metadata,
-            "embedding": self.embedding
+            "embedding": self.embedding.tolist() if self.embedding is not None else None
         }
 
     @classmethod
@@ -73,4 +79,4 @@ class DocumentChunk:
         """
         Check if the chunk has an embedding
         """
-        return self.embedding is not None and len(self.embedding) > 0
\ No newline at end of file
+        return self.embedding is not None and self.embedding.size > 0
\ No newline at end of file
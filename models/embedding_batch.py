@@ -0,0 +1,50 @@
+from dataclasses import dataclass
+from typing import Dict, Any, List, Union
+import numpy as np
+from models.embedding_record import EmbeddingRecord
+
+@dataclass
+class EmbeddingRecordBatch:
+    """
+    Embedding records laid out column-wise for bulk upload to Qdrant
+
+    vectors is a single (K, D) float32 matrix, so a batch is sent without
+    building one Python float list per record.
+    """
+    ids: List[Union[str, int]]
+    vectors: np.ndarray
+    payloads: List[Dict[str, Any]]
+
+    def __post_init__(self):
+        """Store the vectors as one contiguous float32 matrix"""
+        self.vectors = np.ascontiguousarray(self.vectors, dtype=np.float32)
+
+        if self.vectors.ndim != 2:
+            raise ValueError("Batch vectors must be a 2-D matrix")
+
+        if not len(self.ids) == len(self.vectors) == len(self.payloads):
+            raise ValueError("Batch ids, vectors and payloads must have the same length")
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @classmethod
+    def from_records(cls, records: List[EmbeddingRecord]) -> 'EmbeddingRecordBatch':
+        """
+        Create a batch by stacking the vectors of individual records
+        """
+        return cls(
+            ids=[record.id for record in records],
+            vectors=np.stack([np.asarray(record.vector, dtype=np.float32) for record in records]),
+            payloads=[record.payload for record in records]
+        )
+
+    def slice(self, start: int, end: int) -> 'EmbeddingRecordBatch':
+        """
+        Get the records in [start, end) as a batch; vectors are a view, not a copy
+        """
+        return EmbeddingRecordBatch(
+            ids=self.ids[start:end],
+            vectors=self.vectors[start:end],
+            payloads=self.payloads[start:end]
+        )
@@ -1,14 +1,15 @@
 from dataclasses import dataclass
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Union
 from datetime import datetime
+import numpy as np
 
-@dataclass
+@dataclass(slots=True)
 class EmbeddingRecord:
     """
     A vector representation of document content stored in Qdrant
     """
     id: str
-    vector: List[float]
+    vector: Union[List[float], np.ndarray]
     payload: Dict[str, Any]
 
     def to_dict(self) -> Dict[str, Any]:
@@ -17,7 +18,7 @@ class EmbeddingRecord:
         """
         return {
             "id": self.id,
-            "vector": self.vector,
+            "vector": self.vector.tolist() if isinstance(self.vector, np.ndarray) else self.vector,
             "payload": self.payload
         }
 
@@ -39,20 +40,28 @@ class EmbeddingRecord:
         if not self.id:
             raise ValueError("Embedding record must have an ID")
 
-        if not self.vector or len(self.vector) == 0:
+        if self.vector is None or len(self.vector) == 0:
             raise ValueError("Embedding record must have a vector")
 
-        if not isinstance(self.vector, list):
-            raise ValueError("Vector must be a list of floats")
-
-        if not all(isinstance(x, (int, float)) for x in self.vector):
-            raise ValueError("Vector must contain only numeric values")
-
         if not self.payload:
             raise ValueError("Embedding record must have payload data")
 
-        if not isinstance(self.payload, dict):
-            raise ValueError("Payload must be a dictionary")
+        # One C-level pass over the vector instead of an isinstance check per element
+        vector = np.asarray(self.vector)
+
+        # Type checks guard against producer bugs; python -O compiles them out
+        if __debug__:
+            if vector.ndim != 1:
+                raise ValueError("Vector must be a flat sequence of floats")
+
+            if vector.dtype.kind not in 'biuf':
+                raise ValueError("Vector must contain only numeric values")
+
+            if not isinstance(self.payload, dict):
+                raise ValueError("Payload must be a dictionary")
+
+        # Stored as float32 regardless of the optimize flag
+        self.vector = vector.astype(np.float32, copy=False)
 
         return True
 
@@ -60,7 +69,7 @@ class EmbeddingRecord:
         """
         Get the dimension of the embedding vector
         """
-        return len(self.vector) if self.vector else 0
+        return len(self.vector) if self.vector is not None else 0
 
     def has_valid_payload(self) -> bool:
         """
@@ -1,10 +1,35 @@
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterator
+import hashlib
 import re
+import uuid
 import logging
 from models.document_chunk import DocumentChunk
 
 logger = logging.getLogger(__name__)
 
+# Chunk break points, paragraph before sentence before clause
+BREAK_SEPARATORS = ('\n\n', '\n\r\n', '. ', '! ', '? ', '; ', ': ', ' - ', ' -- ')
+
+# A non-blank run of text between sentence terminators
+_SENTENCE_RE = re.compile(r'[^.!?]*[^.!?\s][^.!?]*')
+
+def _chunk_id_prefix(source_url: str, document_hierarchy: str) -> 'hashlib._Hash':
+    """
+    Hash the part of a chunk ID name shared by every chunk of a document, once per document
+    """
+    return hashlib.sha1(uuid.NAMESPACE_URL.bytes + f"{source_url}#{document_hierarchy}#".encode('utf-8'))
+
+def _chunk_id(prefix: 'hashlib._Hash', chunk_index: int) -> str:
+    """
+    Build a chunk ID that is stable across runs, so re-ingesting a page overwrites its points
+
+    Equal to uuid5(NAMESPACE_URL, "<source_url>#<document_hierarchy>#<chunk_index>"),
+    which Qdrant accepts as a point ID natively.
+    """
+    digest = prefix.copy()
+    digest.update(str(chunk_index).encode('ascii'))
+    return str(uuid.UUID(bytes=digest.digest()[:16], version=5))
+
 class TextChunker:
     """
     Text chunking module to split content into meaningful segments
@@ -29,22 +54,46 @@ class TextChunker:
         """
         Split text into chunks of specified size with overlap
         """
+        chunks = list(self.iter_chunks(text, chunk_size, overlap, source_url, document_hierarchy, metadata))
+
+        # Update total chunks in metadata
+        total_chunks = len(chunks)
+        for chunk in chunks:
+            chunk.metadata['total_chunks'] = total_chunks
+
+        return chunks
+
+    def iter_chunks(
+        self,
+        text: str,
+        chunk_size: int = None,
+        overlap: int = None,
+        source_url: str = "",
+        document_hierarchy: str = "",
+        metadata: Dict[str, Any] = None
+    ) -> Iterator[DocumentChunk]:
+        """
+        Yield chunks of text as they are cut, without holding the whole document's chunks
+
+        total_chunks is not known while streaming and is left at 0; use
+        chunk_text when it is needed.
+        """
         if chunk_size is None:
             chunk_size = self.default_chunk_size
         if overlap is None:
             overlap = self.default_overlap
 
         if not text or len(text.strip()) == 0:
-            return []
+            return
 
         if metadata is None:
             metadata = {}
 
-        chunks = []
+        id_prefix = _chunk_id_prefix(source_url, document_hierarchy)
+        chunk_index = 0
         start = 0
         text_length = len(text)
 
-        chunk_index = 0
         while start < text_length:
             end = start + chunk_size
 
@@ -54,8 +103,8 @@ class TextChunker:
                 search_start = max(0, end - 200)  # Look back up to 200 chars
                 found_break = False
 
-                # Look for paragraph breaks first
-                for sep in ['\n\n', '\n\r\n', '. ', '! ', '? ', '; ', ': ', ' - ', ' -- ']:
+                # Look for paragraph breaks first; each rfind only scans the 200-char window
+                for sep in BREAK_SEPARATORS:
                     pos = text.rfind(sep, search_start, end)
                     if pos != -1:
                         # Include the separator in the chunk
@@ -73,19 +122,18 @@ class TextChunker:
             chunk_text = text[start:end].strip()
 
             if chunk_text:  # Only add non-empty chunks
-                # Generate a unique integer ID by combining hash of source URL and chunk index
-                # Use modulo to keep the ID within a reasonable range for Qdrant
-                chunk_id = (abs(hash(source_url)) % 1000000) * 1000 + chunk_index  # Use integer ID
+                # Skipped chunks don't take an index, so it is final when the chunk is built
+                chunk_id = _chunk_id(id_prefix, chunk_index)
 
-                # Create chunk metadata
-                chunk_metadata = metadata.copy()
-                chunk_metadata.update({
+                # Create chunk metadata in one dict display instead of copy() + update()
+                chunk_metadata = {
+                    **metadata,
                     'start_pos': start,
                     'end_pos': end,
                     'chunk_index': chunk_index,
-                    'total_chunks': 0,  # Will be updated after all chunks are created
+                    'total_chunks': 0,  # Set by chunk_text once all chunks are created
                     'chunk_size': len(chunk_text)
-                })
+                }
 
                 chunk = DocumentChunk(
                     id=chunk_id,
@@ -98,9 +146,11 @@ class TextChunker:
                 # Validate the chunk
                 try:
                     chunk.validate()
-                    chunks.append(chunk)
                 except ValueError as e:
                     logger.warning(f"Skipping invalid chunk: {str(e)}")
+                else:
+                    yield chunk
+                    chunk_index += 1
 
             # Move to next chunk position with overlap
             start = end - overlap if end < text_length else end
@@ -109,15 +159,6 @@ class TextChunker:
             if start < text_length and text_length - start < overlap:
                 break
 
-            chunk_index += 1
-
-        # Update total chunks in metadata
-        for i, chunk in enumerate(chunks):
-            chunk.metadata['total_chunks'] = len(chunks)
-            chunk.metadata['chunk_index'] = i
-
-        return chunks
-
     def chunk_by_headings(
         self,
         text: str,
@@ -145,6 +186,9 @@ class TextChunker:
 
         chunks = []
         chunk_index = 0
+        # One prefix and running index for the whole document, so sections that
+        # share a heading text still get distinct IDs
+        id_prefix = _chunk_id_prefix(source_url, document_hierarchy)
 
         # Create chunks based on heading sections
         for i, heading in enumerate(headings):
@@ -170,6 +214,7 @@ class TextChunker:
                     metadata
                 )
                 for sub_chunk in sub_chunks:
+                    sub_chunk.id = _chunk_id(id_prefix, chunk_index)
                     sub_chunk.metadata.update({
                         'heading_text': heading['text'],
                         'heading_level': heading['level'],
@@ -179,7 +224,7 @@ class TextChunker:
                     chunk_index += 1
             else:
                 # Create a single chunk for this heading section
-                chunk_id = f"{hash(source_url)}_{chunk_index}"
+                chunk_id = _chunk_id(id_prefix, chunk_index)
 
                 chunk_metadata = metadata.copy() if metadata else {}
                 chunk_metadata.update({
@@ -251,14 +296,13 @@ class TextChunker:
         """
         Estimate an optimal chunk size based on target number of sentences
         """
-        # Count sentences in the content
-        sentences = re.split(r'[.!?]+', content)
-        sentences = [s.strip() for s in sentences if s.strip()]
+        # Count sentences in the content without building the split list
+        sentence_count = sum(1 for _ in _SENTENCE_RE.finditer(content))
 
-        if not sentences:
+        if not sentence_count:
             return self.default_chunk_size
 
-        avg_sentence_length = len(content) // len(sentences) if sentences else 100
+        avg_sentence_length = len(content) // sentence_count
         estimated_size = avg_sentence_length * target_sentences
 
         return min(estimated_size, self.default_chunk_size)
\ No newline at end of file
@@ -6,6 +6,7 @@ and validate the retrieval results for a RAG chatbot system.
 """
 
 import logging
+import numpy as np
 from typing import List, Dict, Any, Optional
 from clients.qdrant_client import QdrantService
 from clients.cohere_client import CohereService
@@ -29,9 +30,12 @@ class RetrievalValidator:
         self.qdrant_service = QdrantService(
             self.config.qdrant_url,
             self.config.qdrant_api_key,
-            self.config.qdrant_collection_name
+            self.config.qdrant_collection_name,
+            self.config.qdrant_quantization,
+            self.config.qdrant_prefer_grpc,
+            self.config.qdrant_grpc_port
         )
-        self.cohere_service = CohereService(self.config.cohere_api_key)
+        self.cohere_service = CohereService(self.config.cohere_api_key, self.config.cohere_embedding_type)
 
         self.logger.info("RetrievalValidator initialized successfully")
 
@@ -63,6 +67,36 @@ class RetrievalValidator:
             self.logger.error(f"Error retrieving chunks for query '{query}': {str(e)}")
             raise
 
+    def retrieve_chunks_batch(self, queries: List[str], limit: int = 5) -> List[List[Dict[str, Any]]]:
+        """
+        Retrieve relevant document chunks for several queries at once
+
+        All queries are embedded in one Cohere request and searched in one
+        Qdrant batch request, instead of two round trips per query.
+
+        Args:
+            queries: The search query strings
+            limit: Maximum number of results to return per query (default: 5)
+
+        Returns:
+            One list of retrieved chunks per query, in the same order as queries
+        """
+        if not queries:
+            return []
+
+        self.logger.info(f"Retrieving chunks for {len(queries)} queries")
+
+        try:
+            query_embeddings = self.cohere_service.generate_embeddings(queries)
+            results = self.qdrant_service.search_batch(query_embeddings, limit=limit)
+
+            self.logger.info(f"Retrieved {sum(len(r) for r in results)} chunks for {len(queries)} queries")
+            return results
+
+        except Exception as e:
+            self.logger.error(f"Error retrieving chunks for {len(queries)} queries: {str(e)}")
+            raise
+
     def validate_retrieval(self, query: str, results: List[Dict[str, Any]]) -> Dict[str, Any]:
         """
         Validate the retrieval results for relevance and metadata consistency
@@ -98,22 +132,22 @@ class RetrievalValidator:
             return validation_report
 
         # Calculate similarity score metrics
-        scores = []
-        source_urls = set()
+        scores = np.fromiter((result.get('score', 0) for result in results), dtype=np.float64, count=len(results))
+        payloads = [result.get('payload', {}) for result in results]
         metadata_complete_count = 0
 
-        for i, result in enumerate(results):
-            score = result.get('score', 0)
-            scores.append(score)
+        # Sources of results with complete metadata
+        source_urls = set()
 
-            # Check metadata completeness
-            payload = result.get('payload', {})
-            required_fields = ['source_url', 'content']
-            missing_fields = [field for field in required_fields if not payload.get(field)]
+        for i, payload in enumerate(payloads):
+            score = float(scores[i])
+
+            # Check metadata completeness, stopping at the first missing field
+            has_required_metadata = bool(payload.get('source_url')) and bool(payload.get('content'))
 
-            if not missing_fields:
+            if has_required_metadata:
                 metadata_complete_count += 1
-                source_urls.add(payload.get('source_url', ''))
+                source_urls.add(payload['source_url'])
 
             # Validate content relevance (basic check for non-empty content)
             content = payload.get('content', '').strip()
@@ -130,14 +164,14 @@ class RetrievalValidator:
                 'score': score,
                 'source_url': source_url,
                 'content_length': len(content),
-                'has_required_metadata': len(missing_fields) == 0
+                'has_required_metadata': has_required_metadata
             })
 
         # Calculate metrics
-        if scores:
-            validation_report['metrics']['avg_similarity_score'] = sum(scores) / len(scores)
-            validation_report['metrics']['min_similarity_score'] = min(scores)
-            validation_report['metrics']['max_similarity_score'] = max(scores)
+        if scores.size:
+            validation_report['metrics']['avg_similarity_score'] = float(scores.mean())
+            validation_report['metrics']['min_similarity_score'] = float(scores.min())
+            validation_report['metrics']['max_similarity_score'] = float(scores.max())
 
         validation_report['metrics']['unique_sources'] = len(source_urls)
         validation_report['metrics']['metadata_completeness'] = (
@@ -184,39 +218,66 @@ class RetrievalValidator:
         try:
             # Retrieve chunks
             results = self.retrieve_chunks(query, limit)
-
-            # Validate results
-            validation_report = self.validate_retrieval(query, results)
-
-            # Combine results
-            combined_result = {
-                'query': query,
-                'retrieval_results': results,
-                'validation_report': validation_report,
-                'is_successful': True
-            }
+            combined_result = self._combined_result(query, results)
 
             self.logger.info(f"Search and validation completed successfully for query: '{query}'")
             return combined_result
 
         except Exception as e:
             self.logger.error(f"Error in search and validation for query '{query}': {str(e)}")
+            return self._failed_result(query, e)
 
-            return {
+    def search_and_validate_batch(self, queries: List[str], limit: int = 5) -> List[Dict[str, Any]]:
+        """
+        Perform retrieval and validation for several queries with batched requests
+
+        Args:
+            queries: The search query strings
+            limit: Maximum number of results to return per query (default: 5)
+
+        Returns:
+            One combined result per query, in the same shape as search_and_validate
+        """
+        self.logger.info(f"Performing search and validation for {len(queries)} queries")
+
+        try:
+            batch_results = self.retrieve_chunks_batch(queries, limit)
+        except Exception as e:
+            self.logger.error(f"Error in batched search and validation: {str(e)}")
+            return [self._failed_result(query, e) for query in queries]
+
+        return [self._combined_result(query, results) for query, results in zip(queries, batch_results)]
+
+    def _combined_result(self, query: str, results: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Validate retrieval results and combine them into a single report
+        """
+        return {
+            'query': query,
+            'retrieval_results': results,
+            'validation_report': self.validate_retrieval(query, results),
+            'is_successful': True
+        }
+
+    def _failed_result(self, query: str, error: Exception) -> Dict[str, Any]:
+        """
+        Build the combined result for a query whose retrieval failed
+        """
+        return {
+            'query': query,
+            'retrieval_results': [],
+            'validation_report': {
                 'query': query,
-                'retrieval_results': [],
-                'validation_report': {
-                    'query': query,
-                    'total_results': 0,
-                    'validation_timestamp': datetime.now().isoformat(),
-                    'is_valid': False,
-                    'issues': [f"Retrieval error: {str(e)}"],
-                    'metrics': {},
-                    'validation_details': []
-                },
-                'is_successful': False,
-                'error': str(e)
-            }
+                'total_results': 0,
+                'validation_timestamp': datetime.now().isoformat(),
+                'is_valid': False,
+                'issues': [f"Retrieval error: {str(error)}"],
+                'metrics': {},
+                'validation_details': []
+            },
+            'is_successful': False,
+            'error': str(error)
+        }
 
     def validate_source_consistency(self, results: List[Dict[str, Any]]) -> bool:
         """
@@ -264,11 +325,11 @@ def main():
 
     logger.info("Starting retrieval and validation tests...")
 
-    for query in test_queries:
-        logger.info(f"\n--- Testing query: '{query}' ---")
+    # Embed and search all queries in one batch each
+    results = validator.search_and_validate_batch(test_queries, limit=3)
 
-        # Perform search and validation
-        result = validator.search_and_validate(query, limit=3)
+    for query, result in zip(test_queries, results):
+        logger.info(f"\n--- Testing query: '{query}' ---")
 
         # Print results
         print(f"\nQuery: '{query}'")
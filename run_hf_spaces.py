@@ -21,6 +21,32 @@ from main import run_ingestion_pipeline, create_services, validate_configuration
 from config import get_config
 import uvicorn
 
+def needs_ingestion(services, config) -> bool:
+    """
+    Check whether the vector store still has to be populated
+
+    Spaces restart often while the Qdrant collection persists, so ingestion is
+    skipped when the collection already holds MIN_EXPECTED_CHUNKS vectors,
+    unless FORCE_REINGEST is set.
+    """
+    logger = logging.getLogger(__name__)
+
+    if config.force_reingest:
+        logger.info("FORCE_REINGEST is set, re-running ingestion")
+        return True
+
+    try:
+        existing = services['qdrant_service'].get_vector_count(exact=False)
+    except Exception:
+        # Most likely the collection does not exist yet
+        return True
+
+    if existing >= config.min_expected_chunks:
+        logger.info(f"Collection already holds ~{existing} vectors, skipping ingestion")
+        return False
+
+    return True
+
 def main():
     """
     Main function to run the RAG Chatbot backend on Hugging Face Spaces
@@ -49,13 +75,14 @@ def main():
         logger.info("Creating services...")
         services = create_services(config)
 
-        # Run ingestion pipeline to populate vector store
+        # Run ingestion pipeline to populate vector store, unless a previous start already did
         # This will crawl the Docusaurus book and store embeddings in Qdrant
-        logger.info("Running ingestion pipeline to populate vector store...")
-        success = run_ingestion_pipeline(services, resume=False)
+        if needs_ingestion(services, config):
+            logger.info("Running ingestion pipeline to populate vector store...")
+            success = run_ingestion_pipeline(services, resume=False)
 
-        if not success:
-            logger.warning("Ingestion pipeline did not complete successfully, continuing anyway...")
+            if not success:
+                logger.warning("Ingestion pipeline did not complete successfully, continuing anyway...")
 
         # Determine the port for Hugging Face Spaces
         port = int(os.getenv("PORT", 7860))
@@ -1,14 +1,37 @@
-import json
 import os
 import pickle
-from typing import Dict, Any, List, Optional, Union
+import orjson
+from typing import Dict, Any, Iterator, List, Optional, Tuple, Union
 import logging
 from datetime import datetime
 from dataclasses import dataclass, asdict
 from models.document_chunk import DocumentChunk
 
+try:
+    import zstandard
+except ImportError:  # zstandard is optional, old checkpoints are deleted instead of archived without it
+    zstandard = None
+
 logger = logging.getLogger(__name__)
 
+# Side-file suffixes for the append-only lists of a checkpoint
+URL_LOG_SUFFIX = ".urls.log"
+CHUNK_LOG_SUFFIX = ".chunks.log"
+
+# Suffix of a checkpoint archived by cleanup_old_checkpoints, lists inline
+ARCHIVE_SUFFIX = ".json.zst"
+
+# (mtime_ns, size) of a checkpoint's JSON file and its URL and chunk side logs, None for a missing log;
+# appends grow a log's size even within one mtime tick
+FileStamp = Tuple[Tuple[int, int], Optional[Tuple[int, int]], Optional[Tuple[int, int]]]
+
+# Trained zstd dictionaries are kept as .zstd.<dict_id>.dict; the newest one compresses new archives
+COMPRESSION_DICT_PREFIX = ".zstd."
+COMPRESSION_DICT_SUFFIX = ".dict"
+
+# Archives compressing worse than this with the current dictionary trigger a retrain
+COMPRESSION_DICT_MIN_RATIO = 4.0
+
 @dataclass
 class Checkpoint:
     """
@@ -34,8 +57,8 @@ class Checkpoint:
         return cls(
             checkpoint_id=data['checkpoint_id'],
             timestamp=timestamp,
-            processed_urls=data['processed_urls'],
-            processed_chunks=data['processed_chunks'],
+            processed_urls=data.get('processed_urls', []),
+            processed_chunks=data.get('processed_chunks', []),
             current_position=data['current_position'],
             metadata=data['metadata']
         )
@@ -50,6 +73,12 @@ class CheckpointService:
         Initialize the checkpoint service
         """
         self.checkpoint_dir = checkpoint_dir
+        # checkpoint_id -> (file stamp, parsed checkpoint), so unchanged files are parsed once
+        self._cache: Dict[str, Tuple[FileStamp, Checkpoint]] = {}
+        # dict_id -> trained zstd dictionary; _current_dict_id is None until looked up, 0 when there is none
+        self._compression_dicts: Dict[int, Any] = {}
+        self._current_dict_id: Optional[int] = None
+        self._retrain_dict = False
         self._ensure_checkpoint_dir()
 
     def _ensure_checkpoint_dir(self):
@@ -71,16 +100,39 @@ class CheckpointService:
         checkpoint = Checkpoint(
             checkpoint_id=checkpoint_id,
             timestamp=datetime.now(),
-            processed_urls=processed_urls,
+            # Copied, so a caller extending its own list can't change what was logged
+            processed_urls=list(processed_urls),
             processed_chunks=[chunk.id for chunk in processed_chunks],
             current_position=current_position,
             metadata=metadata
         )
 
+        # The URL and chunk lists go to append-only side logs; only what's new since
+        # the previous checkpoint with this ID is written
+        cached = self._cache.get(checkpoint_id)
+        previous = cached[1] if cached is not None else None
+        self._write_log(
+            self._log_path(checkpoint_id, URL_LOG_SUFFIX),
+            checkpoint.processed_urls,
+            previous.processed_urls if previous else None
+        )
+        self._write_log(
+            self._log_path(checkpoint_id, CHUNK_LOG_SUFFIX),
+            checkpoint.processed_chunks,
+            previous.processed_chunks if previous else None
+        )
+
         # Save checkpoint to file
         checkpoint_path = os.path.join(self.checkpoint_dir, f"{checkpoint_id}.json")
-        with open(checkpoint_path, 'w') as f:
-            json.dump(checkpoint.to_dict(), f, indent=2)
+        with open(checkpoint_path, 'wb') as f:
+            f.write(orjson.dumps({
+                'checkpoint_id': checkpoint.checkpoint_id,
+                'timestamp': checkpoint.timestamp.isoformat(),
+                'current_position': checkpoint.current_position,
+                'metadata': checkpoint.metadata
+            }, option=orjson.OPT_INDENT_2))
+        # We just built this checkpoint, so never read our own write back
+        self._cache[checkpoint_id] = (self._file_stamp(checkpoint_id), checkpoint)
 
         logger.info(f"Created checkpoint: {checkpoint_id} with {len(processed_urls)} URLs and {len(processed_chunks)} chunks")
         return checkpoint
@@ -91,27 +143,241 @@ class CheckpointService:
         """
         checkpoint_path = os.path.join(self.checkpoint_dir, f"{checkpoint_id}.json")
 
-        if not os.path.exists(checkpoint_path):
-            logger.info(f"Checkpoint {checkpoint_id} does not exist")
-            return None
+        try:
+            stamp = self._file_stamp(checkpoint_id)
+        except FileNotFoundError:
+            self._cache.pop(checkpoint_id, None)
+            return self._load_archived_checkpoint(checkpoint_id)
+
+        cached = self._cache.get(checkpoint_id)
+        if cached is not None and cached[0] == stamp:
+            return cached[1]
 
         try:
-            with open(checkpoint_path, 'r') as f:
-                data = json.load(f)
+            with open(checkpoint_path, 'rb') as f:
+                data = orjson.loads(f.read())
             checkpoint = Checkpoint.from_dict(data)
+
+            # Checkpoints written before the side logs keep their lists inline
+            if 'processed_urls' not in data:
+                checkpoint.processed_urls = self._read_log(self._log_path(checkpoint_id, URL_LOG_SUFFIX))
+            if 'processed_chunks' not in data:
+                checkpoint.processed_chunks = self._read_log(self._log_path(checkpoint_id, CHUNK_LOG_SUFFIX))
+            self._cache[checkpoint_id] = (stamp, checkpoint)
             logger.info(f"Loaded checkpoint: {checkpoint_id}")
             return checkpoint
         except Exception as e:
             logger.error(f"Error loading checkpoint {checkpoint_id}: {str(e)}")
             return None
 
+    def _load_archived_checkpoint(self, checkpoint_id: str) -> Optional[Checkpoint]:
+        """
+        Load a checkpoint that cleanup_old_checkpoints compressed to cold storage
+        """
+        archive_path = os.path.join(self.checkpoint_dir, f"{checkpoint_id}{ARCHIVE_SUFFIX}")
+
+        if zstandard is None or not os.path.exists(archive_path):
+            logger.info(f"Checkpoint {checkpoint_id} does not exist")
+            return None
+
+        try:
+            with open(archive_path, 'rb') as f:
+                compressed = f.read()
+            # The frame header names the dictionary it was compressed with, 0 for none
+            dict_id = zstandard.get_frame_parameters(compressed).dict_id
+            decompressor = zstandard.ZstdDecompressor(dict_data=self._compression_dict(dict_id) if dict_id else None)
+            data = orjson.loads(decompressor.decompress(compressed))
+            checkpoint = Checkpoint.from_dict(data)
+            logger.info(f"Loaded archived checkpoint: {checkpoint_id}")
+            return checkpoint
+        except Exception as e:
+            logger.error(f"Error loading archived checkpoint {checkpoint_id}: {str(e)}")
+            return None
+
+    def archive_checkpoint(self, checkpoint_id: str) -> bool:
+        """
+        Compress a checkpoint and its side logs into a single zstd archive, then remove them
+
+        Archived checkpoints are no longer listed, but load_checkpoint still reads them.
+        """
+        checkpoint = self.load_checkpoint(checkpoint_id)
+        if not checkpoint:
+            return False
+
+        archive_path = os.path.join(self.checkpoint_dir, f"{checkpoint_id}{ARCHIVE_SUFFIX}")
+        try:
+            compression_dict = self._current_compression_dict()
+            compressor = zstandard.ZstdCompressor(level=3, threads=-1, dict_data=compression_dict)
+            data = orjson.dumps(checkpoint.to_dict())
+            compressed = compressor.compress(data)
+            with open(archive_path, 'wb') as f:
+                f.write(compressed)
+        except Exception as e:
+            logger.error(f"Error archiving checkpoint {checkpoint_id}: {str(e)}")
+            return False
+
+        if compression_dict is not None and len(data) / len(compressed) < COMPRESSION_DICT_MIN_RATIO:
+            logger.info(f"Checkpoint {checkpoint_id} compressed {len(data) / len(compressed):.1f}x, dictionary will be retrained")
+            self._retrain_dict = True
+
+        return self.delete_checkpoint(checkpoint_id)
+
+    def train_compression_dict(self, checkpoint_ids: List[str], dict_size: int = 16384) -> bool:
+        """
+        Train a zstd dictionary over checkpoints for archive_checkpoint to compress with
+
+        Checkpoints are small and share their keys and URL prefixes, which a
+        dictionary trained across many of them models better than compressing
+        each one alone. Earlier dictionaries are kept so their archives stay readable.
+        """
+        samples = []
+        for checkpoint_id in checkpoint_ids:
+            checkpoint = self.load_checkpoint(checkpoint_id)
+            if checkpoint:
+                samples.append(orjson.dumps(checkpoint.to_dict()))
+
+        try:
+            compression_dict = zstandard.train_dictionary(dict_size, samples)
+        except zstandard.ZstdError as e:
+            logger.warning(f"Could not train compression dictionary from {len(samples)} checkpoints: {str(e)}")
+            return False
+
+        dict_id = compression_dict.dict_id()
+        with open(self._compression_dict_path(dict_id), 'wb') as f:
+            f.write(compression_dict.as_bytes())
+
+        self._compression_dicts[dict_id] = compression_dict
+        self._current_dict_id = dict_id
+        self._retrain_dict = False
+        logger.info(f"Trained compression dictionary {dict_id} from {len(samples)} checkpoints")
+        return True
+
+    def _compression_dict_path(self, dict_id: int) -> str:
+        """Get the path of a trained compression dictionary"""
+        return os.path.join(self.checkpoint_dir, f"{COMPRESSION_DICT_PREFIX}{dict_id}{COMPRESSION_DICT_SUFFIX}")
+
+    def _compression_dict(self, dict_id: int) -> Optional[Any]:
+        """
+        Get a trained compression dictionary by ID, reading it from disk once
+        """
+        if dict_id not in self._compression_dicts:
+            try:
+                with open(self._compression_dict_path(dict_id), 'rb') as f:
+                    self._compression_dicts[dict_id] = zstandard.ZstdCompressionDict(f.read())
+            except FileNotFoundError:
+                logger.error(f"Compression dictionary {dict_id} does not exist")
+                return None
+
+        return self._compression_dicts[dict_id]
+
+    def _current_compression_dict(self) -> Optional[Any]:
+        """
+        Get the newest trained compression dictionary, or None if none was trained
+        """
+        if self._current_dict_id is None:
+            newest = (0, 0)
+            with os.scandir(self.checkpoint_dir) as entries:
+                for entry in entries:
+                    if entry.name.startswith(COMPRESSION_DICT_PREFIX) and entry.name.endswith(COMPRESSION_DICT_SUFFIX):
+                        dict_id = entry.name[len(COMPRESSION_DICT_PREFIX):-len(COMPRESSION_DICT_SUFFIX)]
+                        if dict_id.isdigit():
+                            newest = max(newest, (entry.stat().st_mtime_ns, int(dict_id)))
+            self._current_dict_id = newest[1]
+
+        return self._compression_dict(self._current_dict_id) if self._current_dict_id else None
+
+    def append_processed_url(self, checkpoint_id: str, url: str):
+        """
+        Record a processed URL on an existing checkpoint without rewriting it
+        """
+        self._append_to_log(checkpoint_id, URL_LOG_SUFFIX, url, 'processed_urls')
+
+    def append_processed_chunk(self, checkpoint_id: str, chunk_id: str):
+        """
+        Record a processed chunk ID on an existing checkpoint without rewriting it
+        """
+        self._append_to_log(checkpoint_id, CHUNK_LOG_SUFFIX, chunk_id, 'processed_chunks')
+
+    def _append_to_log(self, checkpoint_id: str, suffix: str, entry: str, field: str):
+        """
+        Append one entry to a checkpoint side log, keeping a cached checkpoint in step
+        """
+        # A cached checkpoint is only kept if no other writer touched its files since it was read
+        cached = self._cache.get(checkpoint_id)
+        fresh = cached is not None and cached[0] == self._file_stamp(checkpoint_id)
+
+        with open(self._log_path(checkpoint_id, suffix), 'a') as f:
+            f.write(f"{entry}\n")
+
+        if fresh:
+            getattr(cached[1], field).append(str(entry))
+            self._cache[checkpoint_id] = (self._file_stamp(checkpoint_id), cached[1])
+        else:
+            self._cache.pop(checkpoint_id, None)
+
+    def _file_stamp(self, checkpoint_id: str) -> FileStamp:
+        """
+        Stat a checkpoint's JSON file and side logs; raises FileNotFoundError if the JSON file is missing
+        """
+        json_stat = os.stat(os.path.join(self.checkpoint_dir, f"{checkpoint_id}.json"))
+        return (
+            (json_stat.st_mtime_ns, json_stat.st_size),
+            self._log_stamp(self._log_path(checkpoint_id, URL_LOG_SUFFIX)),
+            self._log_stamp(self._log_path(checkpoint_id, CHUNK_LOG_SUFFIX))
+        )
+
+    @staticmethod
+    def _log_stamp(path: str) -> Optional[Tuple[int, int]]:
+        """Get the (mtime_ns, size) of a side log, or None if it does not exist"""
+        try:
+            log_stat = os.stat(path)
+        except FileNotFoundError:
+            return None
+        return log_stat.st_mtime_ns, log_stat.st_size
+
+    def _log_path(self, checkpoint_id: str, suffix: str) -> str:
+        """Get the path of a checkpoint side log"""
+        return os.path.join(self.checkpoint_dir, f"{checkpoint_id}{suffix}")
+
+    def _write_log(self, path: str, entries: List[str], previous: Optional[List[str]]):
+        """
+        Write a side log, appending only the new tail when entries extend the previous list
+        """
+        if (
+            previous is not None
+            and len(entries) >= len(previous)
+            and entries[:len(previous)] == previous
+            and os.path.exists(path)
+        ):
+            new_entries = entries[len(previous):]
+            mode = 'a'
+        else:
+            new_entries = entries
+            mode = 'w'
+
+        with open(path, mode, buffering=1 << 16) as f:
+            f.writelines(f"{entry}\n" for entry in new_entries)
+
+    def _read_log(self, path: str) -> List[str]:
+        """
+        Read a side log in one read, ignoring a partially written last line
+        """
+        try:
+            with open(path, 'r') as f:
+                lines = f.read().split('\n')
+        except FileNotFoundError:
+            return []
+
+        # Every complete entry ends with a newline, so the last piece is '' or a torn write
+        return lines[:-1]
+
     def list_checkpoints(self) -> List[str]:
         """
         List all available checkpoints
         """
         try:
-            files = os.listdir(self.checkpoint_dir)
-            checkpoint_ids = [f.replace('.json', '') for f in files if f.endswith('.json')]
+            with os.scandir(self.checkpoint_dir) as entries:
+                checkpoint_ids = [entry.name[:-len('.json')] for entry in entries if entry.name.endswith('.json')]
             logger.info(f"Found {len(checkpoint_ids)} checkpoints")
             return checkpoint_ids
         except Exception as e:
@@ -127,6 +393,11 @@ class CheckpointService:
         if os.path.exists(checkpoint_path):
             try:
                 os.remove(checkpoint_path)
+                for suffix in (URL_LOG_SUFFIX, CHUNK_LOG_SUFFIX):
+                    log_path = self._log_path(checkpoint_id, suffix)
+                    if os.path.exists(log_path):
+                        os.remove(log_path)
+                self._cache.pop(checkpoint_id, None)
                 logger.info(f"Deleted checkpoint: {checkpoint_id}")
                 return True
             except Exception as e:
@@ -139,23 +410,37 @@ class CheckpointService:
     def get_latest_checkpoint(self) -> Optional[Checkpoint]:
         """
         Get the most recent checkpoint
+
+        Checkpoints are ordered by file modification time, which is when they
+        were written, so only the newest readable one is parsed.
         """
-        checkpoint_ids = self.list_checkpoints()
-        if not checkpoint_ids:
-            return None
+        for checkpoint_id in reversed(self._checkpoint_ids_by_age()):
+            checkpoint = self.load_checkpoint(checkpoint_id)
+            if checkpoint:
+                return checkpoint
 
-        # Sort by timestamp (assuming checkpoint_id contains timestamp info)
-        # If not, we'll load each and find the most recent
-        latest_checkpoint = None
-        latest_time = None
+        return None
 
-        for checkpoint_id in checkpoint_ids:
-            checkpoint = self.load_checkpoint(checkpoint_id)
-            if checkpoint and (latest_time is None or checkpoint.timestamp > latest_time):
-                latest_checkpoint = checkpoint
-                latest_time = checkpoint.timestamp
+    def iter_checkpoints_with_mtime(self) -> Iterator[Tuple[str, int]]:
+        """
+        Yield (checkpoint_id, mtime_ns) for every checkpoint, from a single directory scan
+        """
+        with os.scandir(self.checkpoint_dir) as entries:
+            for entry in entries:
+                if entry.name.endswith('.json'):
+                    yield entry.name[:-len('.json')], entry.stat().st_mtime_ns
 
-        return latest_checkpoint
+    def _checkpoint_ids_by_age(self) -> List[str]:
+        """
+        Get checkpoint IDs ordered oldest first
+        """
+        try:
+            mtimes = sorted(self.iter_checkpoints_with_mtime(), key=lambda item: (item[1], item[0]))
+        except OSError as e:
+            logger.error(f"Error listing checkpoints: {str(e)}")
+            return []
+
+        return [checkpoint_id for checkpoint_id, _ in mtimes]
 
     def create_url_checkpoint(self,
                             checkpoint_id: str,
@@ -338,29 +623,30 @@ class CheckpointService:
     def cleanup_old_checkpoints(self, keep_last_n: int = 5) -> bool:
         """
         Clean up old checkpoints, keeping only the last N
+
+        Older checkpoints are archived with zstd when it is installed and
+        deleted otherwise. A compression dictionary is trained over all
+        checkpoints first if there is none yet or the last one compressed poorly.
         """
         try:
-            all_checkpoints = self.list_checkpoints()
-
-            # Sort checkpoints by timestamp to identify oldest ones
-            checkpoint_objects = []
-            for cp_id in all_checkpoints:
-                cp = self.load_checkpoint(cp_id)
-                if cp:
-                    checkpoint_objects.append(cp)
-
-            # Sort by timestamp (oldest first)
-            checkpoint_objects.sort(key=lambda x: x.timestamp)
+            # Oldest first, by file modification time, without parsing any checkpoint
+            checkpoint_ids = self._checkpoint_ids_by_age()
 
             # Identify checkpoints to delete (keep only the last N)
-            if len(checkpoint_objects) <= keep_last_n:
-                logger.info(f"No checkpoints to clean up. Total: {len(checkpoint_objects)}, keeping: {keep_last_n}")
+            if len(checkpoint_ids) <= keep_last_n:
+                logger.info(f"No checkpoints to clean up. Total: {len(checkpoint_ids)}, keeping: {keep_last_n}")
                 return True
 
-            checkpoints_to_delete = checkpoint_objects[:-keep_last_n]
+            checkpoints_to_delete = checkpoint_ids[:-keep_last_n]
+
+            if zstandard is not None and (self._retrain_dict or self._current_compression_dict() is None):
+                self.train_compression_dict(checkpoint_ids)
 
-            for cp in checkpoints_to_delete:
-                self.delete_checkpoint(cp.checkpoint_id)
+            for checkpoint_id in checkpoints_to_delete:
+                if zstandard is not None:
+                    self.archive_checkpoint(checkpoint_id)
+                else:
+                    self.delete_checkpoint(checkpoint_id)
 
             logger.info(f"Cleaned up {len(checkpoints_to_delete)} old checkpoints")
             return True
@@ -1,4 +1,7 @@
-from typing import List, Dict, Any, Optional
+from typing import Callable, Iterator, List, Dict, Any, Optional
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
 import logging
 import time
 from crawlers.web_crawler import WebCrawler
@@ -29,112 +32,137 @@ class CrawlService:
         self.crawler = WebCrawler(base_url, delay, max_depth)
         self.extractor = HTMLExtractor()
         self.chunker = TextChunker(chunk_size, chunk_overlap)
-        self.url_discovery = URLDiscovery(base_url)
+        # Share the crawler's connection pool so discovery and crawling reuse connections
+        self.url_discovery = URLDiscovery(base_url, session=self.crawler.session)
 
     def crawl_and_extract(self) -> List[Dict[str, Any]]:
         """
         Crawl the Docusaurus book and extract content
+
+        Pages are fetched concurrently and returned in discovery order.
         """
         logger.info(f"Starting crawl and extraction for: {self.base_url}")
 
+        all_extracted_content = list(self._iter_crawled())
+
+        logger.info(f"Completed crawl and extraction. Processed {len(all_extracted_content)} pages.")
+        return all_extracted_content
+
+    def _iter_crawled(self, progress_callback: Optional[Callable[[int, int, str], None]] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Discover the book's URLs and yield each successfully extracted page in discovery order
+
+        Only a bounded window of pages is fetched ahead of the consumer, so
+        pages are not all held in memory at once. progress_callback, if given,
+        is called with (done, total, message) as each URL is reached.
+        """
         # Discover all URLs in the book
         logger.info("Discovering URLs...")
         urls = self.url_discovery.discover_all_urls(self.base_url, self.max_depth)
         logger.info(f"Discovered {len(urls)} URLs to crawl")
 
-        all_extracted_content = []
+        workers = self.crawler.max_workers
 
-        # Crawl each URL
-        for i, url in enumerate(urls):
-            logger.info(f"Crawling ({i+1}/{len(urls)}): {url}")
+        # Fetch pages on the crawler's worker threads; its rate limiter spaces out requests
+        # to each domain, so there is no sleep between pages
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            url_iter = iter(urls)
+            in_flight = deque(
+                (url, executor.submit(self.crawler.extract_page_content, url))
+                for url in islice(url_iter, 2 * workers)
+            )
 
-            try:
-                page_data = self.crawler.extract_page_content(url)
-
-                if page_data.get('status') == 'success':
-                    # Use the content extracted by the crawler directly
-                    # The crawler already handles Docusaurus-specific extraction
-                    extracted = {
-                        'content': page_data.get('content', ''),
-                        'title': page_data.get('title', ''),
-                        'headings': page_data.get('headings', []),
-                        'hierarchy': page_data.get('hierarchy', 'Unknown'),
-                        'url': url
-                    }
-
-                    all_extracted_content.append(extracted)
-
-                    # Add delay between requests to be respectful
-                    time.sleep(self.delay)
-                else:
-                    logger.warning(f"Failed to crawl {url}: {page_data.get('error')}")
-
-            except Exception as e:
-                logger.error(f"Error processing {url}: {str(e)}")
-                continue
+            i = 0
+            while in_flight:
+                url, future = in_flight.popleft()
+                for next_url in islice(url_iter, 1):
+                    in_flight.append((next_url, executor.submit(self.crawler.extract_page_content, next_url)))
+
+                if progress_callback:
+                    progress_callback(i, len(urls), f"Processing {url}")
+
+                i += 1
+                logger.info(f"Crawled ({i}/{len(urls)}): {url}")
+
+                try:
+                    page_data = future.result()
+
+                    if page_data.get('status') == 'success':
+                        # Use the content extracted by the crawler directly
+                        # The crawler already handles Docusaurus-specific extraction
+                        yield {
+                            'content': page_data.get('content', ''),
+                            'title': page_data.get('title', ''),
+                            'headings': page_data.get('headings', []),
+                            'hierarchy': page_data.get('hierarchy', 'Unknown'),
+                            'url': url
+                        }
+                    else:
+                        logger.warning(f"Failed to crawl {url}: {page_data.get('error')}")
+
+                except Exception as e:
+                    logger.error(f"Error processing {url}: {str(e)}")
+                    continue
 
-        logger.info(f"Completed crawl and extraction. Processed {len(all_extracted_content)} pages.")
-        return all_extracted_content
+        if progress_callback:
+            progress_callback(len(urls), len(urls), "Crawling completed")
 
-    def chunk_extracted_content(self, extracted_content: List[Dict[str, Any]]) -> List[DocumentChunk]:
+    def _chunk_one(self, content_item: Dict[str, Any]) -> List[DocumentChunk]:
         """
-        Chunk the extracted content into DocumentChunk objects
+        Clean and chunk a single extracted page
         """
-        all_chunks = []
+        content = content_item.get('content', '')
+        url = content_item.get('url', '')
+        title = content_item.get('title', '')
+        hierarchy = content_item.get('hierarchy', 'Unknown')
 
-        for content_item in extracted_content:
-            content = content_item.get('content', '')
-            url = content_item.get('url', '')
-            title = content_item.get('title', '')
-            hierarchy = content_item.get('hierarchy', 'Unknown')
-
-            if not content or len(content.strip()) == 0:
-                continue
-
-            # Clean the content
-            cleaned_content = clean_text(content)
-
-            # Create metadata for the chunk
-            metadata = {
-                'title': title,
-                'url': url,
-                'extracted_at': time.time(),
-                'source_type': 'docusaurus_page'
-            }
-
-            # Chunk the content
-            chunks = self.chunker.chunk_text(
-                cleaned_content,
-                self.chunk_size,
-                self.chunk_overlap,
-                url,
-                hierarchy,
-                metadata
-            )
+        if not content or len(content.strip()) == 0:
+            return []
+
+        # Clean the content
+        cleaned_content = clean_text(content)
+
+        # Create metadata for the chunk
+        metadata = {
+            'title': title,
+            'url': url,
+            'extracted_at': time.time(),
+            'source_type': 'docusaurus_page'
+        }
 
-            all_chunks.extend(chunks)
+        return self.chunker.chunk_text(cleaned_content, self.chunk_size, self.chunk_overlap, url, hierarchy, metadata)
+
+    def chunk_extracted_content(self, extracted_content: List[Dict[str, Any]]) -> List[DocumentChunk]:
+        """
+        Chunk the extracted content into DocumentChunk objects
+        """
+        all_chunks = [chunk for content_item in extracted_content for chunk in self._chunk_one(content_item)]
 
         logger.info(f"Created {len(all_chunks)} chunks from extracted content.")
         return all_chunks
 
-    def crawl_extract_and_chunk(self) -> List[DocumentChunk]:
+    def crawl_extract_and_chunk(self, progress_callback: Optional[Callable[[int, int, str], None]] = None) -> Iterator[DocumentChunk]:
         """
-        Complete workflow: crawl -> extract -> chunk
+        Complete workflow: crawl -> extract -> chunk, as a stream of chunks
+
+        Each page is chunked as soon as it is extracted and its chunks are
+        yielded before the next page is read, so memory holds the pages in
+        flight rather than the whole crawl.
         """
         logger.info("Starting complete crawl -> extract -> chunk workflow")
 
-        # Step 1: Crawl and extract
-        extracted_content = self.crawl_and_extract()
+        chunk_count = 0
+        pages = 0
+        for page in self._iter_crawled(progress_callback):
+            for chunk in self._chunk_one(page):
+                chunk_count += 1
+                yield chunk
+            pages += 1
 
-        if not extracted_content:
+        if not pages:
             logger.warning("No content extracted from crawling")
-            return []
 
-        # Step 2: Chunk the extracted content
-        chunks = self.chunk_extracted_content(extracted_content)
-
-        logger.info(f"Workflow completed. Created {len(chunks)} document chunks.")
-        return chunks
+        logger.info(f"Workflow completed. Created {chunk_count} document chunks from {pages} pages.")
 
     def get_crawl_statistics(self) -> Dict[str, Any]:
         """
@@ -193,55 +221,17 @@ class CrawlService:
     def crawl_with_progress_callback(self, progress_callback=None) -> List[DocumentChunk]:
         """
         Crawl with progress callback for UI updates
+
+        Pages are fetched concurrently, like crawl_and_extract.
         """
         logger.info(f"Starting crawl with progress tracking for: {self.base_url}")
 
-        # Discover all URLs in the book
-        logger.info("Discovering URLs...")
-        urls = self.url_discovery.discover_all_urls(self.base_url, self.max_depth)
-        total_urls = len(urls)
-        logger.info(f"Discovered {total_urls} URLs to crawl")
-
         all_chunks = []
         processed_count = 0
 
-        for i, url in enumerate(urls):
-            if progress_callback:
-                progress_callback(i, total_urls, f"Processing {url}")
-
-            logger.info(f"Crawling ({i+1}/{total_urls}): {url}")
+        for extracted in self._iter_crawled(progress_callback):
+            all_chunks.extend(self._chunk_one(extracted))
+            processed_count += 1
 
-            try:
-                page_data = self.crawler.extract_page_content(url)
-
-                if page_data.get('status') == 'success':
-                    # Use the content extracted by the crawler directly
-                    # The crawler already handles Docusaurus-specific extraction
-                    extracted = {
-                        'content': page_data.get('content', ''),
-                        'title': page_data.get('title', ''),
-                        'headings': page_data.get('headings', []),
-                        'hierarchy': page_data.get('hierarchy', 'Unknown'),
-                        'url': url
-                    }
-
-                    # Chunk the content
-                    page_chunks = self.chunk_extracted_content([extracted])
-                    all_chunks.extend(page_chunks)
-
-                    processed_count += 1
-
-                    # Add delay between requests to be respectful
-                    time.sleep(self.delay)
-                else:
-                    logger.warning(f"Failed to crawl {url}: {page_data.get('error')}")
-
-            except Exception as e:
-                logger.error(f"Error processing {url}: {str(e)}")
-                continue
-
-        if progress_callback:
-            progress_callback(total_urls, total_urls, "Crawling completed")
-
-        logger.info(f"Completed crawl. Processed {processed_count} out of {total_urls} URLs. Created {len(all_chunks)} chunks.")
-        return all_chunks
\ No newline at end of file
+        logger.info(f"Completed crawl. Processed {processed_count} pages. Created {len(all_chunks)} chunks.")
+        return all_chunks
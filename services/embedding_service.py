@@ -1,5 +1,6 @@
 from typing import List, Dict, Any
 import logging
+import numpy as np
 from models.document_chunk import DocumentChunk
 from clients.cohere_client import CohereService
 
@@ -33,6 +34,10 @@ class EmbeddingService:
             # Generate embeddings using Cohere
             embeddings = self.cohere_service.generate_embeddings(texts)
 
+            # Pack the batch into one contiguous float32 matrix; each chunk's
+            # embedding is a row view into it rather than its own allocation
+            embedding_matrix = np.asarray(embeddings, dtype=np.float32)
+
             # Assign embeddings back to chunks
             updated_chunks = []
             for i, chunk in enumerate(chunks):
@@ -43,7 +48,7 @@ class EmbeddingService:
                     source_url=chunk.source_url,
                     document_hierarchy=chunk.document_hierarchy,
                     metadata=chunk.metadata,
-                    embedding=embeddings[i] if i < len(embeddings) else None
+                    embedding=embedding_matrix[i] if i < len(embedding_matrix) else None
                 )
                 updated_chunks.append(updated_chunk)
 
@@ -90,13 +95,12 @@ class EmbeddingService:
         for chunk in chunks:
             if chunk.has_embedding():
                 stats['with_embeddings'] += 1
-                if chunk.embedding:
-                    total_size += len(chunk.embedding)
-                    # Basic validation: check if embedding is a list of floats
-                    if isinstance(chunk.embedding, list) and all(isinstance(x, (int, float)) for x in chunk.embedding):
-                        stats['valid_embeddings'] += 1
-                    else:
-                        stats['invalid_embeddings'] += 1
+                total_size += chunk.embedding.size
+                # Basic validation: check if embedding is a flat vector of finite floats
+                if chunk.embedding.ndim == 1 and np.isfinite(chunk.embedding).all():
+                    stats['valid_embeddings'] += 1
+                else:
+                    stats['invalid_embeddings'] += 1
             else:
                 stats['without_embeddings'] += 1
 
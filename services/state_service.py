@@ -1,5 +1,5 @@
-import json
 import os
+import orjson
 from typing import Dict, Any, List, Optional
 import logging
 from datetime import datetime
@@ -67,8 +67,8 @@ class StateService:
         Save the current pipeline state to a file
         """
         try:
-            with open(self.state_file_path, 'w') as f:
-                json.dump(state.to_dict(), f, indent=2)
+            with open(self.state_file_path, 'wb') as f:
+                f.write(orjson.dumps(state.to_dict(), option=orjson.OPT_INDENT_2))
             logger.info(f"Pipeline state saved to {self.state_file_path}")
             return True
         except Exception as e:
@@ -84,8 +84,8 @@ class StateService:
             return None
 
         try:
-            with open(self.state_file_path, 'r') as f:
-                data = json.load(f)
+            with open(self.state_file_path, 'rb') as f:
+                data = orjson.loads(f.read())
             state = PipelineState.from_dict(data)
             logger.info(f"Pipeline state loaded from {self.state_file_path}")
             return state
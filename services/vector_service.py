@@ -1,4 +1,5 @@
-from typing import List, Dict, Any
+from itertools import groupby
+from typing import List, Dict, Any, Iterable
 import logging
 from models.document_chunk import DocumentChunk
 from services.embedding_service import EmbeddingService
@@ -106,42 +107,53 @@ class VectorService:
             logger.error(f"Error getting vector database stats: {str(e)}")
             raise
 
-    def process_chunks_in_batches(self, chunks: List[DocumentChunk], batch_size: int = 96) -> Dict[str, Any]:
+    def process_chunks_in_batches(self, chunks: Iterable[DocumentChunk], batch_size: int = 96) -> Dict[str, Any]:
         """
         Process chunks in batches to respect API limits
-        """
-        if not chunks:
-            return {
-                'total_chunks': 0,
-                'embedded_chunks': 0,
-                'stored_chunks': 0,
-                'success': True
-            }
 
-        total_chunks = len(chunks)
-        logger.info(f"Processing {total_chunks} chunks in batches of {batch_size}")
+        chunks may be any iterable, such as a streamed crawl, so only one batch
+        needs to be held in memory at a time. Batches are cut only between
+        pages: storage skips chunks whose source URL is already stored, so a
+        page split across batches would lose its later chunks. A batch can
+        therefore exceed batch_size by up to one page's chunks.
+        """
+        logger.info(f"Processing chunks in batches of {batch_size}")
 
         all_results = {
-            'total_chunks': total_chunks,
+            'total_chunks': 0,
             'embedded_chunks': 0,
             'stored_chunks': 0,
             'success': True,
             'batch_results': []
         }
 
-        for i in range(0, total_chunks, batch_size):
-            batch = chunks[i:i + batch_size]
-            logger.info(f"Processing batch {i//batch_size + 1}/{(total_chunks-1)//batch_size + 1}")
+        batch = []
+        for _, page_chunks in groupby(chunks, key=lambda chunk: chunk.source_url):
+            batch.extend(page_chunks)
+            if len(batch) >= batch_size:
+                self._process_batch(batch, all_results)
+                batch = []
 
-            batch_result = self.process_and_store_chunks(batch)
-            all_results['embedded_chunks'] += batch_result['embedded_chunks']
-            all_results['stored_chunks'] += batch_result['stored_chunks']
-            all_results['success'] = all_results['success'] and batch_result['success']
-            all_results['batch_results'].append(batch_result)
+        if batch:
+            self._process_batch(batch, all_results)
 
         logger.info(f"Batch processing completed: {all_results}")
         return all_results
 
+    def _process_batch(self, batch: List[DocumentChunk], all_results: Dict[str, Any]):
+        """
+        Embed and store one batch, adding its counts to all_results
+        """
+        batch_number = len(all_results['batch_results']) + 1
+        logger.info(f"Processing batch {batch_number} ({len(batch)} chunks)")
+
+        batch_result = self.process_and_store_chunks(batch)
+        all_results['total_chunks'] += len(batch)
+        all_results['embedded_chunks'] += batch_result['embedded_chunks']
+        all_results['stored_chunks'] += batch_result['stored_chunks']
+        all_results['success'] = all_results['success'] and batch_result['success']
+        all_results['batch_results'].append(batch_result)
+
     def validate_full_pipeline(self, test_chunks: List[DocumentChunk]) -> Dict[str, Any]:
         """
         Validate the full embedding and storage pipeline
@@ -1,7 +1,9 @@
 from typing import List, Dict, Any
 import logging
 import hashlib
+import numpy as np
 from models.document_chunk import DocumentChunk
+from models.embedding_batch import EmbeddingRecordBatch
 from clients.qdrant_client import QdrantService
 
 logger = logging.getLogger(__name__)
@@ -68,8 +70,9 @@ class VectorStorageService:
         logger.info(f"Storing {len(vectors)} vectors in Qdrant collection {self.qdrant_service.collection_name}")
 
         try:
-            # Store the vectors in Qdrant
-            success = self.qdrant_service.upsert_vectors(vector_ids, vectors, payloads)
+            # Store the vectors in Qdrant as one float32 matrix, overlapping the batch uploads
+            batch = EmbeddingRecordBatch(ids=vector_ids, vectors=np.stack(vectors), payloads=payloads)
+            success = self.qdrant_service.upsert_batch(batch)
             logger.info(f"Successfully stored {len(vectors)} vectors in Qdrant")
             return success
         except Exception as e:
@@ -21,12 +21,17 @@ setup(
         "pydantic>=2.5.0",
         "requests>=2.31.0",
         "beautifulsoup4>=4.12.0",
+        "soupsieve>=2.4",
+        "lxml>=4.9.0",
+        "selectolax>=0.3.21",
         "cohere>=4.0.0",
-        "qdrant-client>=1.7.0",
+        "qdrant-client>=1.15.0",
         "python-dotenv>=1.0.0",
         "openai>=1.0.0",
-        "httpx>=0.25.0",
+        "httpx[http2]>=0.25.0",
         "numpy>=1.21.0",
+        "orjson>=3.9.0",
+        "zstandard>=0.22.0",
     ],
     extras_require={
         "dev": [
@@ -0,0 +1,29 @@
+import unittest
+import os
+import sys
+
+from pydantic import ValidationError
+
+# Add the backend directory to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from agent import AgentQueryRequest
+
+
+class TestAgentQueryRequest(unittest.TestCase):
+    def test_hnsw_ef_default(self):
+        """Test that hnsw_ef defaults to 64."""
+        self.assertEqual(AgentQueryRequest(query="q").hnsw_ef, 64)
+
+    def test_hnsw_ef_bounds(self):
+        """Test that hnsw_ef outside 1..512 is rejected."""
+        for hnsw_ef in (0, -5, 513, 100000):
+            with self.assertRaises(ValidationError):
+                AgentQueryRequest(query="q", hnsw_ef=hnsw_ef)
+
+        self.assertEqual(AgentQueryRequest(query="q", hnsw_ef=512).hnsw_ef, 512)
+        self.assertIsNone(AgentQueryRequest(query="q", hnsw_ef=None).hnsw_ef)
+
+
+if __name__ == '__main__':
+    unittest.main()
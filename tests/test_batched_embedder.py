@@ -0,0 +1,137 @@
+import asyncio
+import unittest
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+import os
+import sys
+
+# Add the backend directory to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from clients.cohere_client import CohereService, BatchedEmbedder
+
+
+class TestBatchedEmbedder(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        """Set up test fixtures before each test method."""
+        self.cohere_service = CohereService("test-key")
+        self.cohere_service.generate_embeddings_async = AsyncMock(
+            side_effect=lambda texts: [[float(len(text))] for text in texts]
+        )
+
+    async def test_concurrent_requests_share_one_call(self):
+        """Test that concurrent requests are coalesced into a single embed call."""
+        embedder = BatchedEmbedder(self.cohere_service, max_batch_size=96, max_wait_ms=20)
+        texts = ["a", "bb", "ccc", "dddd"]
+
+        embeddings = await asyncio.gather(*(embedder.embed_one(text) for text in texts))
+        await embedder.aclose()
+
+        self.assertEqual(embeddings, [[1.0], [2.0], [3.0], [4.0]])
+        self.cohere_service.generate_embeddings_async.assert_awaited_once_with(texts)
+
+    async def test_batches_are_capped(self):
+        """Test that a batch is dispatched once it reaches max_batch_size."""
+        embedder = BatchedEmbedder(self.cohere_service, max_batch_size=2, max_wait_ms=20)
+
+        await asyncio.gather(*(embedder.embed_one(text) for text in ["a", "b", "c", "d", "e"]))
+        await embedder.aclose()
+
+        batch_sizes = [len(call.args[0]) for call in self.cohere_service.generate_embeddings_async.await_args_list]
+        self.assertEqual(batch_sizes, [2, 2, 1])
+
+    async def test_cached_text_skips_batch(self):
+        """Test that a text embedded before is served from the cache."""
+        embedder = BatchedEmbedder(self.cohere_service)
+
+        await embedder.embed_one("repeat")
+        await embedder.embed_one("repeat")
+        await embedder.aclose()
+
+        self.assertEqual(self.cohere_service.generate_embeddings_async.await_count, 1)
+
+    async def test_error_reaches_every_caller(self):
+        """Test that a failed embed call is raised to each waiting request."""
+        self.cohere_service.generate_embeddings_async = AsyncMock(side_effect=RuntimeError("boom"))
+        embedder = BatchedEmbedder(self.cohere_service)
+
+        results = await asyncio.gather(embedder.embed_one("a"), embedder.embed_one("b"), return_exceptions=True)
+        await embedder.aclose()
+
+        self.assertTrue(all(isinstance(result, RuntimeError) for result in results))
+
+    async def test_aclose_fails_pending_requests(self):
+        """Test that requests not yet dispatched fail instead of hanging when the embedder closes."""
+        embedder = BatchedEmbedder(self.cohere_service, max_batch_size=10, max_wait_ms=10000)
+
+        # The worker is still collecting these into a batch when the embedder closes
+        tasks = [asyncio.create_task(embedder.embed_one(text)) for text in ["a", "b", "c"]]
+        await asyncio.sleep(0.01)
+        await embedder.aclose()
+
+        results = await asyncio.wait_for(asyncio.gather(*tasks, return_exceptions=True), 1)
+        self.assertTrue(all(isinstance(result, RuntimeError) for result in results))
+        self.cohere_service.generate_embeddings_async.assert_not_awaited()
+
+    async def test_aclose_fails_queued_requests(self):
+        """Test that requests left in the queue fail when the embedder closes."""
+        embedder = BatchedEmbedder(self.cohere_service)
+        # Queue the request without a worker to collect it
+        embedder._loop = asyncio.get_running_loop()
+        embedder._queue = asyncio.Queue()
+        embedder._ensure_worker = lambda: None
+
+        task = asyncio.create_task(embedder.embed_one("a"))
+        await asyncio.sleep(0.01)
+        await embedder.aclose()
+
+        with self.assertRaises(RuntimeError):
+            await asyncio.wait_for(task, 1)
+
+    async def test_aclose_waits_for_dispatched_batches(self):
+        """Test that a batch already sent to Cohere still resolves its callers on close."""
+        release = asyncio.Event()
+
+        async def slow_embed(texts):
+            await release.wait()
+            return [[1.0] for _ in texts]
+
+        self.cohere_service.generate_embeddings_async = AsyncMock(side_effect=slow_embed)
+        embedder = BatchedEmbedder(self.cohere_service, max_wait_ms=1)
+
+        task = asyncio.create_task(embedder.embed_one("a"))
+        await asyncio.sleep(0.05)
+        close = asyncio.create_task(embedder.aclose())
+        await asyncio.sleep(0.01)
+        self.assertFalse(close.done())
+
+        release.set()
+        await close
+        self.assertEqual(await task, [1.0])
+
+    async def test_usable_after_aclose(self):
+        """Test that the embedder starts a new worker when used again after closing."""
+        embedder = BatchedEmbedder(self.cohere_service)
+        await embedder.aclose()
+
+        self.assertEqual(await embedder.embed_one("abc"), [3.0])
+        await embedder.aclose()
+
+
+class TestGenerateEmbeddingsAsync(unittest.IsolatedAsyncioTestCase):
+    async def test_splits_at_batch_limit(self):
+        """Test that more texts than Cohere's batch limit are split across requests in order."""
+        cohere_service = CohereService("test-key")
+        cohere_service.async_client.embed = AsyncMock(
+            side_effect=lambda texts, **kwargs: SimpleNamespace(embeddings=[[float(text)] for text in texts])
+        )
+
+        embeddings = await cohere_service.generate_embeddings_async([str(i) for i in range(200)])
+
+        self.assertEqual(embeddings, [[float(i)] for i in range(200)])
+        batch_sizes = [len(call.kwargs['texts']) for call in cohere_service.async_client.embed.await_args_list]
+        self.assertEqual(batch_sizes, [96, 96, 8])
+
+
+if __name__ == '__main__':
+    unittest.main()
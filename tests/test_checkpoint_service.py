@@ -0,0 +1,113 @@
+import unittest
+import os
+import shutil
+import sys
+import tempfile
+
+# Add the backend directory to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from models.document_chunk import DocumentChunk
+from services.checkpoint_service import CheckpointService, ARCHIVE_SUFFIX, zstandard
+
+
+class TestCheckpointService(unittest.TestCase):
+    def setUp(self):
+        """Set up test fixtures before each test method."""
+        self.checkpoint_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.checkpoint_dir)
+        self.service = CheckpointService(self.checkpoint_dir)
+
+    def create_test_chunk(self, chunk_id: str) -> DocumentChunk:
+        """Helper method to create a test chunk."""
+        return DocumentChunk(
+            id=chunk_id,
+            content="Test content",
+            source_url="https://example.com",
+            document_hierarchy="Test",
+            metadata={}
+        )
+
+    def test_side_log_round_trip(self):
+        """Test that URLs and chunk IDs written to the side logs load back."""
+        self.service.create_checkpoint(
+            "run", ["https://example.com/a"], [self.create_test_chunk("c1")], {'stage': 'crawl'}
+        )
+        self.service.create_checkpoint(
+            "run",
+            ["https://example.com/a", "https://example.com/b"],
+            [self.create_test_chunk("c1"), self.create_test_chunk("c2")],
+            {'stage': 'chunk'}
+        )
+
+        checkpoint = CheckpointService(self.checkpoint_dir).load_checkpoint("run")
+        self.assertEqual(checkpoint.processed_urls, ["https://example.com/a", "https://example.com/b"])
+        self.assertEqual(checkpoint.processed_chunks, ["c1", "c2"])
+        self.assertEqual(checkpoint.current_position, {'stage': 'chunk'})
+
+    def test_append_round_trip(self):
+        """Test that appended entries are seen by this and a fresh service."""
+        self.service.create_checkpoint("run", ["https://example.com/a"], [], {})
+        self.service.append_processed_url("run", "https://example.com/b")
+        self.service.append_processed_chunk("run", "c1")
+
+        for service in (self.service, CheckpointService(self.checkpoint_dir)):
+            checkpoint = service.load_checkpoint("run")
+            self.assertEqual(checkpoint.processed_urls, ["https://example.com/a", "https://example.com/b"])
+            self.assertEqual(checkpoint.processed_chunks, ["c1"])
+
+    def test_cache_sees_other_writers(self):
+        """Test that a cached checkpoint is reloaded after another service appends to it."""
+        other = CheckpointService(self.checkpoint_dir)
+        self.service.create_checkpoint("run", ["https://example.com/a"], [], {})
+        self.assertEqual(other.load_checkpoint("run").processed_urls, ["https://example.com/a"])
+
+        self.service.append_processed_url("run", "https://example.com/b")
+        self.assertEqual(other.load_checkpoint("run").processed_urls, ["https://example.com/a", "https://example.com/b"])
+
+        other.append_processed_url("run", "https://example.com/c")
+        self.assertEqual(
+            self.service.load_checkpoint("run").processed_urls,
+            ["https://example.com/a", "https://example.com/b", "https://example.com/c"]
+        )
+
+    @unittest.skipIf(zstandard is None, "zstandard is not installed")
+    def test_archive_and_restore(self):
+        """Test that an archived checkpoint is removed from the listing but still loads."""
+        self.service.create_checkpoint(
+            "run", ["https://example.com/a"], [self.create_test_chunk("c1")], {'stage': 'store'}, {'note': 'x'}
+        )
+
+        self.assertTrue(self.service.archive_checkpoint("run"))
+        self.assertTrue(os.path.exists(os.path.join(self.checkpoint_dir, f"run{ARCHIVE_SUFFIX}")))
+        self.assertNotIn("run", self.service.list_checkpoints())
+
+        checkpoint = CheckpointService(self.checkpoint_dir).load_checkpoint("run")
+        self.assertEqual(checkpoint.processed_urls, ["https://example.com/a"])
+        self.assertEqual(checkpoint.processed_chunks, ["c1"])
+        self.assertEqual(checkpoint.current_position, {'stage': 'store'})
+        self.assertEqual(checkpoint.metadata, {'note': 'x'})
+
+    @unittest.skipIf(zstandard is None, "zstandard is not installed")
+    def test_archive_with_compression_dict(self):
+        """Test that checkpoints archived with a trained dictionary restore in a fresh service."""
+        checkpoint_ids = [f"run-{i}" for i in range(200)]
+        for i, checkpoint_id in enumerate(checkpoint_ids):
+            urls = [f"https://example.com/docs/section-{i % 7}/page-{j}" for j in range(i % 5 + 1)]
+            self.service.create_checkpoint(checkpoint_id, urls, [], {'stage': 'crawl', 'index': i})
+
+        if not self.service.train_compression_dict(checkpoint_ids, dict_size=4096):
+            self.skipTest("not enough sample data to train a dictionary")
+        for checkpoint_id in checkpoint_ids[:3]:
+            self.assertTrue(self.service.archive_checkpoint(checkpoint_id))
+
+        with open(os.path.join(self.checkpoint_dir, f"run-2{ARCHIVE_SUFFIX}"), 'rb') as f:
+            self.assertNotEqual(zstandard.get_frame_parameters(f.read()).dict_id, 0)
+
+        checkpoint = CheckpointService(self.checkpoint_dir).load_checkpoint("run-2")
+        self.assertEqual(checkpoint.processed_urls, [f"https://example.com/docs/section-2/page-{j}" for j in range(3)])
+        self.assertEqual(checkpoint.current_position, {'stage': 'crawl', 'index': 2})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,83 @@
+import unittest
+from unittest.mock import patch
+import os
+import sys
+
+# Add the backend directory to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from extractors import html_extractor
+from extractors.html_extractor import HTMLExtractor
+
+
+PAGE_HTML = """
+<html>
+<head><title>Page</title></head>
+<body>
+  <nav><a href="/top">Top</a></nav>
+  <article>
+    <h1>Title</h1>
+    <p>Body text with <a href="/in">a link</a>.</p>
+    <nav class="pagination-nav"><a href="/next">Next</a></nav>
+    <div class="sidebar-menu"><a href="/side">Side</a></div>
+  </article>
+</body>
+</html>
+"""
+
+
+class TestBuildHierarchy(unittest.TestCase):
+    def setUp(self):
+        """Set up test fixtures before each test method."""
+        self.extractor = HTMLExtractor()
+
+    def build(self, *levels_and_texts) -> str:
+        """Helper method to build a hierarchy from (level, text) pairs."""
+        return self.extractor._build_hierarchy([{'level': level, 'text': text} for level, text in levels_and_texts])
+
+    def test_no_headings(self):
+        """Test that a page without headings is Unknown."""
+        self.assertEqual(self.build(), "Unknown")
+
+    def test_title_and_first_subheading(self):
+        """Test that the top heading is followed by the first subheading only."""
+        self.assertEqual(self.build((1, "Title"), (2, "A"), (2, "B")), "Title > A")
+
+    def test_deeper_headings_skipped(self):
+        """Test that headings more than one level below the top are skipped."""
+        self.assertEqual(self.build((1, "Title"), (3, "Deep"), (2, "A")), "Title > A")
+
+    def test_all_top_level_headings_before_subheading(self):
+        """Test that every top level heading before the first subheading is included."""
+        self.assertEqual(self.build((1, "A"), (1, "B"), (2, "C")), "A > B > C")
+
+    def test_stops_at_first_subheading(self):
+        """Test that top level headings after the first subheading are left out."""
+        self.assertEqual(self.build((2, "X"), (3, "Y"), (2, "Z")), "X > Y")
+
+    def test_subheading_before_top_level(self):
+        """Test that a subheading before any top level heading ends the hierarchy."""
+        self.assertEqual(self.build((2, "X"), (1, "Title")), "X")
+
+
+class TestOutlineLinks(unittest.TestCase):
+    def test_links_in_stripped_subtrees_skipped_fast(self):
+        """Test that links in nav/UI subtrees inside the content are skipped with selectolax."""
+        if html_extractor.HTMLParser is None:
+            self.skipTest("selectolax is not installed")
+
+        extracted = HTMLExtractor(cache_size=0).extract_content(PAGE_HTML)
+        self.assertEqual([link['url'] for link in extracted['links']], ['/top', '/in'])
+
+    def test_links_in_stripped_subtrees_skipped_bs4(self):
+        """Test that links in nav/UI subtrees inside the content are skipped with BeautifulSoup."""
+        with patch.object(html_extractor, 'HTMLParser', None):
+            extracted = HTMLExtractor(cache_size=0).extract_content(PAGE_HTML)
+
+        self.assertEqual([link['url'] for link in extracted['links']], ['/top', '/in'])
+        self.assertNotIn("Next", extracted['content'])
+        self.assertIn("Body text", extracted['content'])
+
+
+if __name__ == '__main__':
+    unittest.main()
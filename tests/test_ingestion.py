@@ -3,6 +3,7 @@ from unittest.mock import Mock, patch, MagicMock
 import os
 import sys
 from typing import List
+import numpy as np
 
 # Add the backend directory to the path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
@@ -87,7 +88,8 @@ class TestEmbeddingService(unittest.TestCase):
         # Verify the result
         self.assertEqual(len(result), 1)
         self.assertIsNotNone(result[0].embedding)
-        self.assertEqual(result[0].embedding, [0.1, 0.2, 0.3])
+        self.assertEqual(result[0].embedding.dtype, np.float32)
+        np.testing.assert_allclose(result[0].embedding, [0.1, 0.2, 0.3], rtol=1e-6)
 
     def test_validate_embeddings(self):
         """Test embedding validation."""
@@ -0,0 +1,98 @@
+import unittest
+from unittest.mock import patch
+import os
+import sys
+
+# Add the backend directory to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from crawlers.rate_limiter import RateLimiter
+
+
+class TestRateLimiter(unittest.TestCase):
+    def setUp(self):
+        """Set up test fixtures before each test method."""
+        self.now = 1000.0
+        self.slept = []
+
+        def sleep(seconds):
+            self.slept.append(seconds)
+            self.now += seconds
+
+        for target, fake in (('time.monotonic', lambda: self.now), ('time.sleep', sleep)):
+            patcher = patch(f'crawlers.rate_limiter.{target}', side_effect=fake)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def loosen_global_limit(self, limiter: RateLimiter):
+        """Helper method to raise the global limit and let its bucket fill up."""
+        limiter.set_global_limits(100.0, burst=10)
+        self.now += 1
+
+    def test_burst_is_granted_immediately(self):
+        """Test that a full bucket grants its burst without waiting."""
+        limiter = RateLimiter(default_rate=100.0, default_burst=3)
+        self.loosen_global_limit(limiter)
+
+        for _ in range(3):
+            self.assertTrue(limiter.acquire("https://example.com/page", blocking=False))
+        self.assertFalse(limiter.acquire("https://example.com/page", blocking=False))
+        self.assertEqual(self.slept, [])
+
+    def test_tokens_refill_over_time(self):
+        """Test that tokens come back at the configured rate."""
+        limiter = RateLimiter(default_rate=2.0, default_burst=1)
+        self.loosen_global_limit(limiter)
+
+        self.assertTrue(limiter.acquire("https://example.com/a", blocking=False))
+        self.assertFalse(limiter.acquire("https://example.com/a", blocking=False))
+        self.now += 0.5
+        self.assertTrue(limiter.acquire("https://example.com/a", blocking=False))
+
+    def test_blocking_waits_for_next_token(self):
+        """Test that waiting callers queue up behind each other."""
+        limiter = RateLimiter(default_rate=2.0, default_burst=1)
+        self.loosen_global_limit(limiter)
+
+        limiter.wait("https://example.com/a")
+        limiter.wait("https://example.com/b")
+        limiter.wait("https://example.com/c")
+
+        self.assertEqual(self.slept, [0.5, 0.5])
+
+    def test_domains_have_separate_buckets(self):
+        """Test that one domain's requests don't use another domain's tokens."""
+        limiter = RateLimiter(default_rate=1.0, default_burst=1)
+        self.loosen_global_limit(limiter)
+
+        self.assertTrue(limiter.acquire("https://a.example.com/", blocking=False))
+        self.assertTrue(limiter.acquire("https://b.example.com/", blocking=False))
+        self.assertFalse(limiter.acquire("https://a.example.com/", blocking=False))
+
+    def test_global_limit_returns_domain_token(self):
+        """Test that a request refused by the global bucket doesn't spend a domain token."""
+        limiter = RateLimiter(default_rate=1.0, default_burst=2)
+        limiter.set_global_limits(1.0, burst=1)
+
+        self.assertTrue(limiter.acquire("https://example.com/", blocking=False))
+        self.assertFalse(limiter.acquire("https://example.com/", blocking=False))
+        self.assertEqual(limiter.domains["example.com"]['tokens'], 1.0)
+
+    def test_domain_limits(self):
+        """Test that per-domain limits override the default."""
+        limiter = RateLimiter(default_rate=1.0, default_burst=1)
+        self.loosen_global_limit(limiter)
+        limiter.set_domain_limits("example.com", 10.0, burst=2)
+
+        limiter.wait("https://example.com/a")
+        limiter.wait("https://example.com/b")
+        limiter.wait("https://example.com/c")
+
+        # Spaced at the domain's 10 requests per second, not the default 1
+        self.assertEqual(len(self.slept), 2)
+        for seconds in self.slept:
+            self.assertAlmostEqual(seconds, 0.1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,96 @@
+import unittest
+from unittest.mock import patch
+import os
+import sys
+
+# Add the backend directory to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from agent import SemanticCache
+
+
+class TestSemanticCache(unittest.TestCase):
+    def setUp(self):
+        """Set up test fixtures before each test method."""
+        self.now = 1000.0
+        patcher = patch('agent.time.monotonic', side_effect=lambda: self.now)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_lookup_similar_query(self):
+        """Test that a query above the similarity threshold reuses the cached answer."""
+        cache = SemanticCache(threshold=0.95, max_entries=4, ttl_seconds=60)
+        cache.add([1.0, 0.0], {'answer': 'a'})
+
+        self.assertEqual(cache.lookup([2.0, 0.01]), {'answer': 'a'})
+
+    def test_lookup_below_threshold(self):
+        """Test that a dissimilar query misses."""
+        cache = SemanticCache(threshold=0.95, max_entries=4, ttl_seconds=60)
+        cache.add([1.0, 0.0], {'answer': 'a'})
+
+        self.assertIsNone(cache.lookup([0.7, 0.7]))
+
+    def test_lookup_requires_matching_key(self):
+        """Test that request parameters must match exactly."""
+        cache = SemanticCache(threshold=0.95, max_entries=4, ttl_seconds=60)
+        cache.add([1.0, 0.0], {'answer': 'a'}, key=(5,))
+
+        self.assertIsNone(cache.lookup([1.0, 0.0], key=(3,)))
+        self.assertEqual(cache.lookup([1.0, 0.0], key=(5,)), {'answer': 'a'})
+
+    def test_lookup_returns_most_similar(self):
+        """Test that the closest of several matching entries is returned."""
+        cache = SemanticCache(threshold=0.9, max_entries=4, ttl_seconds=60)
+        cache.add([1.0, 0.2], {'answer': 'near'})
+        cache.add([1.0, 0.0], {'answer': 'exact'})
+
+        self.assertEqual(cache.lookup([1.0, 0.0]), {'answer': 'exact'})
+
+    def test_entries_expire(self):
+        """Test that an entry older than the TTL is no longer served."""
+        cache = SemanticCache(threshold=0.95, max_entries=4, ttl_seconds=60)
+        cache.add([1.0, 0.0], {'answer': 'a'})
+
+        self.now += 61
+        self.assertIsNone(cache.lookup([1.0, 0.0]))
+
+    def test_evicts_least_recently_used(self):
+        """Test that a full cache evicts the entry used longest ago."""
+        cache = SemanticCache(threshold=0.95, max_entries=2, ttl_seconds=60)
+        cache.add([1.0, 0.0], {'answer': 'a'})
+        self.now += 1
+        cache.add([0.0, 1.0], {'answer': 'b'})
+        self.now += 1
+        cache.lookup([1.0, 0.0])
+        self.now += 1
+        cache.add([-1.0, 0.0], {'answer': 'c'})
+
+        self.assertEqual(cache.lookup([1.0, 0.0]), {'answer': 'a'})
+        self.assertIsNone(cache.lookup([0.0, 1.0]))
+        self.assertEqual(cache.lookup([-1.0, 0.0]), {'answer': 'c'})
+
+    def test_reuses_expired_slot_before_evicting(self):
+        """Test that an expired entry is replaced ahead of a live least recently used one."""
+        cache = SemanticCache(threshold=0.95, max_entries=2, ttl_seconds=60)
+        cache.add([1.0, 0.0], {'answer': 'a'})
+        self.now += 50
+        cache.add([0.0, 1.0], {'answer': 'b'})
+        self.now += 20
+        # 'a' is expired but was used most recently
+        cache._last_used[0] = self.now
+        cache.add([-1.0, 0.0], {'answer': 'c'})
+
+        self.assertEqual(cache.lookup([0.0, 1.0]), {'answer': 'b'})
+        self.assertEqual(cache.lookup([-1.0, 0.0]), {'answer': 'c'})
+
+    def test_disabled_cache(self):
+        """Test that max_entries 0 disables caching."""
+        cache = SemanticCache(max_entries=0)
+        cache.add([1.0, 0.0], {'answer': 'a'})
+
+        self.assertIsNone(cache.lookup([1.0, 0.0]))
+
+
+if __name__ == '__main__':
+    unittest.main()
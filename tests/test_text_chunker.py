@@ -0,0 +1,68 @@
+import unittest
+import os
+import sys
+import uuid
+
+# Add the backend directory to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from processors.text_chunker import TextChunker, _chunk_id, _chunk_id_prefix
+
+
+class TestChunkIds(unittest.TestCase):
+    def setUp(self):
+        """Set up test fixtures before each test method."""
+        self.chunker = TextChunker(default_chunk_size=200, default_overlap=20)
+        self.text = " ".join(f"Sentence number {i} talks about robots." for i in range(40))
+
+    def test_chunk_id_is_uuid5(self):
+        """Test that chunk IDs equal uuid5 of the URL, hierarchy and index."""
+        url = "https://example.com/docs/intro"
+        hierarchy = "Intro > Setup"
+        prefix = _chunk_id_prefix(url, hierarchy)
+
+        for index in (0, 1, 10, 123):
+            expected = str(uuid.uuid5(uuid.NAMESPACE_URL, f"{url}#{hierarchy}#{index}"))
+            self.assertEqual(_chunk_id(prefix, index), expected)
+
+    def test_chunk_ids_stable_across_runs(self):
+        """Test that re-chunking the same page gives the same IDs."""
+        first = self.chunker.chunk_text(self.text, source_url="https://example.com/a", document_hierarchy="A")
+        second = TextChunker(default_chunk_size=200, default_overlap=20).chunk_text(
+            self.text, source_url="https://example.com/a", document_hierarchy="A"
+        )
+
+        self.assertGreater(len(first), 1)
+        self.assertEqual([chunk.id for chunk in first], [chunk.id for chunk in second])
+        self.assertEqual(len({chunk.id for chunk in first}), len(first))
+
+    def test_chunk_ids_differ_by_page(self):
+        """Test that the same text on another page gets different IDs."""
+        first = self.chunker.chunk_text(self.text, source_url="https://example.com/a", document_hierarchy="A")
+        second = self.chunker.chunk_text(self.text, source_url="https://example.com/b", document_hierarchy="A")
+
+        self.assertFalse({chunk.id for chunk in first} & {chunk.id for chunk in second})
+
+    def test_repeated_headings_get_unique_ids(self):
+        """Test that sections sharing a heading text don't share chunk IDs."""
+        sections = []
+        headings = []
+        for i, heading_text in enumerate(["Example", "Usage", "Example", "Example"]):
+            headings.append({'text': heading_text, 'level': 2, 'position': sum(len(s) for s in sections)})
+            # Alternate long sections, split into sub-chunks, with short single-chunk ones
+            sections.append(f"{heading_text}\n" + (self.text if i % 2 == 0 else "A short section."))
+        text = "".join(sections)
+
+        chunks = self.chunker.chunk_by_headings(
+            text, headings, source_url="https://example.com/a", document_hierarchy="A"
+        )
+
+        self.assertGreater(len(chunks), len(headings))
+        self.assertEqual(len({chunk.id for chunk in chunks}), len(chunks))
+
+        prefix = _chunk_id_prefix("https://example.com/a", "A")
+        self.assertEqual([chunk.id for chunk in chunks], [_chunk_id(prefix, i) for i in range(len(chunks))])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,79 @@
+import unittest
+from types import SimpleNamespace
+from unittest.mock import Mock
+import os
+import sys
+import numpy as np
+
+# Add the backend directory to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from agent import RetrievalTool, SemanticCache
+from clients.cohere_client import CohereService
+from models.document_chunk import DocumentChunk
+from validators.embedding_validator import EmbeddingValidator
+
+
+class TestUint8Embeddings(unittest.TestCase):
+    def setUp(self):
+        """Set up test fixtures before each test method."""
+        self.cohere_service = CohereService("test-key", embedding_type="uint8")
+
+        # Two unrelated unit vectors, quantized the way Cohere returns uint8 embeddings
+        rng = np.random.default_rng(0)
+        floats = rng.standard_normal((2, 1024))
+        floats /= np.linalg.norm(floats, axis=1, keepdims=True)
+        self.float_cosine = float(floats[0] @ floats[1])
+        int8 = np.clip(np.round(floats / np.abs(floats).max(axis=1, keepdims=True) * 127), -128, 127)
+        self.raw = (int8 + 128).astype(np.uint8)
+
+        response = SimpleNamespace(embeddings=SimpleNamespace(uint8=self.raw.tolist()))
+        self.embeddings = self.cohere_service._extract_embeddings(response)
+
+    @staticmethod
+    def cosine(a, b) -> float:
+        """Helper method to compute cosine similarity, as Qdrant scores a Cosine collection."""
+        a, b = np.asarray(a, dtype=np.float64), np.asarray(b, dtype=np.float64)
+        return float(a @ b / (np.linalg.norm(a) * np.linalg.norm(b)))
+
+    def test_raw_uint8_cosine_is_inflated(self):
+        """Test that the shifted uint8 vectors would look similar if used as they are."""
+        self.assertLess(abs(self.float_cosine), 0.1)
+        self.assertGreater(self.cosine(self.raw[0], self.raw[1]), 0.9)
+
+    def test_decoded_cosine_matches_float(self):
+        """Test that decoded embeddings keep the similarity of the float embeddings."""
+        self.assertAlmostEqual(self.cosine(*self.embeddings), self.float_cosine, delta=0.02)
+
+    def test_unrelated_vectors_filtered_by_min_score(self):
+        """Test that an unrelated chunk doesn't pass the default min_score."""
+        tool = RetrievalTool(Mock(), self.cohere_service, embedder=Mock())
+        results = [{'id': 'chunk', 'score': self.cosine(*self.embeddings), 'payload': {'content': 'unrelated'}}]
+
+        retrieval = tool._build_retrieval_result(results, self.embeddings[0], min_score=0.5, processing_time=0.0)
+        self.assertEqual(retrieval['chunks'], [])
+
+    def test_unrelated_vectors_miss_cache(self):
+        """Test that an unrelated query doesn't hit the semantic cache."""
+        cache = SemanticCache(threshold=0.95)
+        cache.add(self.embeddings[0], {'answer': 'a'})
+
+        self.assertIsNone(cache.lookup(self.embeddings[1]))
+        self.assertEqual(cache.lookup(self.embeddings[0]), {'answer': 'a'})
+
+    def test_decoded_values_pass_validation(self):
+        """Test that decoded embeddings fall within the validator's default value range."""
+        chunks = [
+            DocumentChunk(
+                id=f"chunk-{i}", content="Test content", source_url="https://example.com",
+                document_hierarchy="Test", metadata={}, embedding=embedding
+            )
+            for i, embedding in enumerate(self.embeddings)
+        ]
+
+        result = EmbeddingValidator().validate_embedding_values(chunks)
+        self.assertEqual(result['value_range_issues'], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
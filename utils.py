@@ -1,5 +1,6 @@
 from urllib.parse import urljoin, urlparse
 from typing import List, Set
+from functools import lru_cache
 import re
 
 def is_valid_url(url: str) -> bool:
@@ -12,6 +13,7 @@ def is_valid_url(url: str) -> bool:
     except Exception:
         return False
 
+@lru_cache(maxsize=65536)
 def normalize_url(url: str) -> str:
     """
     Normalize a URL by removing fragments and ensuring proper formatting
@@ -24,6 +26,7 @@ def normalize_url(url: str) -> str:
         normalized = f"{normalized.rstrip('/')}/"
     return normalized
 
+@lru_cache(maxsize=65536)
 def is_same_domain(base_url: str, test_url: str) -> bool:
     """
     Check if two URLs belong to the same domain
@@ -32,6 +35,13 @@ def is_same_domain(base_url: str, test_url: str) -> bool:
     test_domain = urlparse(test_url).netloc
     return base_domain == test_domain
 
+@lru_cache(maxsize=65536)
+def is_same_domain_netloc(base_netloc: str, test_url: str) -> bool:
+    """
+    Check if a URL belongs to a domain whose netloc is already known
+    """
+    return urlparse(test_url).netloc == base_netloc
+
 def clean_text(text: str) -> str:
     """
     Clean extracted text by removing extra whitespace and normalizing
@@ -93,12 +93,9 @@ class EmbeddingValidator:
 
         for chunk in chunks:
             if chunk.has_embedding():
-                has_invalid_values = False
-                for value in chunk.embedding:
-                    if not isinstance(value, (int, float)) or value < min_value or value > max_value:
-                        has_invalid_values = True
-                        value_range_issues += 1
-                        break
+                has_invalid_values = bool(chunk.embedding.min() < min_value or chunk.embedding.max() > max_value)
+                if has_invalid_values:
+                    value_range_issues += 1
 
                 if has_invalid_values:
                     invalid_embeddings += 1
@@ -144,7 +141,7 @@ class EmbeddingValidator:
         for chunk in chunks:
             if chunk.has_embedding():
                 # Calculate the L2 norm of the embedding
-                embedding_array = np.array(chunk.embedding)
+                embedding_array = np.asarray(chunk.embedding)
                 norm = np.linalg.norm(embedding_array)
 
                 if min_norm <= norm <= max_norm:
@@ -290,8 +287,8 @@ class EmbeddingValidator:
                 total_comparisons += 1
 
                 # Calculate cosine similarity
-                emb1 = np.array(chunk1.embedding)
-                emb2 = np.array(chunk2.embedding)
+                emb1 = np.asarray(chunk1.embedding)
+                emb2 = np.asarray(chunk2.embedding)
 
                 # Normalize embeddings
                 emb1_norm = emb1 / np.linalg.norm(emb1)